@@ -1,14 +1,34 @@
 import argparse
+import json
 import subprocess
-from carbontracker.tracker import CarbonTracker
-from carbontracker import parser
-import ast
 
 
 def parse_logs(log_dir):
+    from carbontracker import parser
+
     parser.print_aggregate(log_dir=log_dir)
 
 
+def parse_api_keys(api_keys):
+    """Parses the API keys given as a JSON dictionary. Python dictionary
+    literals (e.g. with single quotes) are still accepted as a fallback."""
+    if not api_keys:
+        return None
+    try:
+        return json.loads(api_keys)
+    except json.JSONDecodeError:
+        pass
+    try:
+        import ast
+
+        return ast.literal_eval(api_keys)
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError(
+            "API keys must be a JSON dictionary with double-quoted keys and "
+            'values, e.g., \'{"electricitymaps": "YOUR_KEY"}\''
+        )
+
+
 def main():
     """
     The **carbontracker** CLI allows the user to track the energy consumption and carbon intensity of any program.
@@ -16,8 +36,10 @@ def main():
 
     Args:
         --log_dir (path, optional): Log directory. Defaults to `./logs`.
-        --api_keys (str, optional): API keys in a dictionary-like format, e.g. `\'{"electricitymaps": "YOUR_KEY"}\'`
+        --api_keys (str, optional): API keys in a JSON dictionary format, e.g. `\'{"electricitymaps": "YOUR_KEY"}\'`
         --parse (path, optional): Directory containing the log files to parse.
+        --offline (flag, optional): Do not make any network requests to detect the location or fetch the carbon intensity. Uses the average carbon intensity of `--country` or the world average.
+        --country (str, optional): Alpha-2 country code, e.g. `DK`, whose average carbon intensity is used in offline mode.
 
     Example:
         Tracking the carbon intensity of `script.py`.
@@ -28,6 +50,10 @@ def main():
 
             $ carbontracker --log_dir='./logs' --api_keys='{"electricitymaps": "API_KEY_EXAMPLE"}' python script.py
 
+        Offline, using the average carbon intensity of Denmark
+
+            $ carbontracker --offline --country DK python script.py
+
         Parsing logs:
 
             $ carbontracker --parse ./internal_logs
@@ -38,12 +64,25 @@ def main():
     cli_parser.add_argument("--log_dir", type=str, default="./logs", help="Log directory")
     cli_parser.add_argument(
         "--api_keys",
-        type=str,
-        help="API keys in a dictionary-like format, e.g., "
+        type=parse_api_keys,
+        help="API keys in a JSON dictionary format, e.g., "
              '\'{"electricitymaps": "YOUR_KEY"}\'',
         default=None,
     )
     cli_parser.add_argument("--parse", type=str, help="Directory containing the log files to parse.")
+    cli_parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Do not make any network requests and use the average carbon "
+             "intensity of --country or the world average.",
+    )
+    cli_parser.add_argument(
+        "--country",
+        type=str,
+        help="Alpha-2 country code whose average carbon intensity is used in "
+             "offline mode, e.g., DK.",
+        default=None,
+    )
 
     # Parse known arguments only
     known_args, remaining_args = cli_parser.parse_known_args()
@@ -53,22 +92,30 @@ def main():
         parse_logs(known_args.parse)
         return
 
-    # Parse the API keys string into a dictionary
-    api_keys = ast.literal_eval(known_args.api_keys) if known_args.api_keys else None
+    # The remaining_args are considered as the command to execute
+    if not remaining_args:
+        cli_parser.print_help()
+        return 2
+
+    # Imported here s.t. parsing logs and printing usage do not import the
+    # tracker and its dependencies such as pandas and geocoder.
+    from carbontracker.tracker import CarbonTracker
 
     tracker = CarbonTracker(
-        epochs=1, log_dir=known_args.log_dir, epochs_before_pred=0, api_keys=api_keys
+        epochs=1,
+        log_dir=known_args.log_dir,
+        epochs_before_pred=0,
+        api_keys=known_args.api_keys,
+        offline=(known_args.country or True) if known_args.offline else False,
     )
     tracker.epoch_start()
 
-    # The remaining_args are considered as the command to execute
-    if remaining_args:
-        try:
-            # Execute the command
-            subprocess.run(remaining_args, check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"Error executing command: {' '.join(remaining_args)}")
-            print(f"Subprocess error: {e}")
+    try:
+        # Execute the command
+        subprocess.run(remaining_args, check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"Error executing command: {' '.join(remaining_args)}")
+        print(f"Subprocess error: {e}")
 
     tracker.epoch_end()
     tracker.stop()
@@ -1,34 +1,114 @@
+import atexit
 import platform
 import subprocess
 import re
+import threading
 import time
 from carbontracker.components.handler import Handler
-from typing import Union, List, Pattern
+from typing import Dict, Tuple, Union, List
+
+_POWER_PATTERN = re.compile(r"(CPU|GPU|ANE) Power: (\d+) mW")
+_SAMPLE_DELIMITER = "*** Sampled system activity"
 
 
 class PowerMetricsUnified:
     _output: Union[None, str] = None
     _last_updated: Union[None, float] = None
+    _parsed: Tuple[Union[None, str], Dict[str, float]] = (None, {})
+    _process: Union[None, subprocess.Popen] = None
+    _reader: Union[None, threading.Thread] = None
+    _output_ready = threading.Event()
 
     @staticmethod
     def get_output():
-        if (
-            PowerMetricsUnified._output is None
-            or PowerMetricsUnified._last_updated is None
-            or time.time() - PowerMetricsUnified._last_updated > 1
-        ):
-            PowerMetricsUnified._output = subprocess.check_output(
-                ["sudo", "powermetrics", "-n", "1", "-i", "100", "--samplers", "all"],
-                universal_newlines=True,
-            )
-            PowerMetricsUnified._last_updated = time.time()
+        """Returns the latest sample of a powermetrics process that is started
+        on first use and keeps sampling in the background."""
+        process = PowerMetricsUnified._process
+        if process is None or process.poll() is not None:
+            PowerMetricsUnified._start()
+        PowerMetricsUnified._output_ready.wait()
+        if PowerMetricsUnified._output is None:
+            process = PowerMetricsUnified._process
+            raise subprocess.CalledProcessError(process.poll(), process.args)
         return PowerMetricsUnified._output
 
+    @staticmethod
+    def _start():
+        PowerMetricsUnified._output = None
+        PowerMetricsUnified._output_ready.clear()
+        process = subprocess.Popen(
+            [
+                "sudo",
+                "powermetrics",
+                "-i",
+                "100",
+                "--samplers",
+                "cpu_power,gpu_power",
+            ],
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        PowerMetricsUnified._process = process
+        PowerMetricsUnified._reader = threading.Thread(
+            target=PowerMetricsUnified._read_samples,
+            args=(process.stdout,),
+            name="PowerMetricsReader",
+            daemon=True,
+        )
+        PowerMetricsUnified._reader.start()
+        atexit.unregister(PowerMetricsUnified._stop)
+        atexit.register(PowerMetricsUnified._stop)
+
+    @staticmethod
+    def _read_samples(stdout):
+        """Publishes each complete sample when the next one begins. Lines
+        before the first sample (e.g. machine info) are skipped."""
+        sample = []
+        for line in stdout:
+            if line.startswith(_SAMPLE_DELIMITER):
+                if sample:
+                    PowerMetricsUnified._publish("".join(sample))
+                sample = [line]
+            elif sample:
+                sample.append(line)
+        if sample:
+            PowerMetricsUnified._publish("".join(sample))
+        # Do not leave callers waiting if powermetrics exits.
+        PowerMetricsUnified._output_ready.set()
+
+    @staticmethod
+    def _publish(sample):
+        PowerMetricsUnified._output = sample
+        PowerMetricsUnified._last_updated = time.time()
+        PowerMetricsUnified._output_ready.set()
+
+    @staticmethod
+    def _stop():
+        process = PowerMetricsUnified._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+        PowerMetricsUnified._process = None
+
+    @staticmethod
+    def get_powers() -> Dict[str, float]:
+        """Returns the CPU, GPU and ANE power (W) found in the output. The
+        output is scanned once and shared by all handlers until it changes."""
+        output = PowerMetricsUnified.get_output()
+        # Snapshot the output and its powers together. They are replaced in a
+        # single assignment s.t. no lock is needed between threads.
+        parsed_output, powers = PowerMetricsUnified._parsed
+        if output is not parsed_output:
+            powers = {}
+            for match in _POWER_PATTERN.finditer(output):
+                # Convert mW to W (J/s).
+                powers.setdefault(match.group(1), float(match.group(2)) / 1000)
+            PowerMetricsUnified._parsed = (output, powers)
+        return powers
+
 
 class AppleSiliconCPU(Handler):
     def init(self, pids=None, devices_by_pid=False):
         self.devices_list = ["CPU"]
-        self.cpu_pattern = re.compile(r"CPU Power: (\d+) mW")
 
     def shutdown(self):
         pass
@@ -41,24 +121,13 @@ class AppleSiliconCPU(Handler):
         return platform.system() == "Darwin"
 
     def power_usage(self) -> List[float]:
-        output = PowerMetricsUnified.get_output()
-        cpu_power = self.parse_power(output, self.cpu_pattern)
-        return [cpu_power]
-
-    def parse_power(self, output: str, pattern: Pattern[str]) -> float:
-        match = pattern.search(output)
-        if match:
-            power = float(match.group(1)) / 1000  # Convert mW to W
-            return power
-        else:
-            return 0.0
+        powers = PowerMetricsUnified.get_powers()
+        return [powers.get("CPU", 0.0)]
 
 
 class AppleSiliconGPU(Handler):
     def init(self, pids=None, devices_by_pid=False):
         self.devices_list = ["GPU", "ANE"]
-        self.gpu_pattern = re.compile(r"GPU Power: (\d+) mW")
-        self.ane_pattern = re.compile(r"ANE Power: (\d+) mW")
 
     def devices(self) -> List[str]:
         """Returns a list of devices (str) associated with the component."""
@@ -68,18 +137,8 @@ class AppleSiliconGPU(Handler):
         return platform.system() == "Darwin"
 
     def power_usage(self):
-        output = PowerMetricsUnified.get_output()
-        gpu_power = self.parse_power(output, self.gpu_pattern)
-        ane_power = self.parse_power(output, self.ane_pattern)
-        return [gpu_power + ane_power]
-
-    def parse_power(self, output: str, pattern: Pattern[str]) -> float:
-        match = pattern.search(output)
-        if match:
-            power = float(match.group(1)) / 1000  # Convert mW to W (J/s)
-            return power
-        else:
-            return 0.0
-        
+        powers = PowerMetricsUnified.get_powers()
+        return [powers.get("GPU", 0.0) + powers.get("ANE", 0.0)]
+
     def shutdown(self):
         pass
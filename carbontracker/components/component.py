@@ -1,12 +1,9 @@
+import importlib
+from array import array
+
 import numpy as np
 
 from carbontracker import exceptions
-from carbontracker.components.gpu import nvidia
-from carbontracker.components.cpu import intel
-from carbontracker.components.apple_silicon.powermetrics import (
-    AppleSiliconCPU,
-    AppleSiliconGPU,
-)
 from carbontracker.components.handler import Handler
 from typing import Iterable, List, Union, Type, Sized
 
@@ -14,45 +11,69 @@ COMPONENTS = [
     {
         "name": "gpu",
         "error": exceptions.GPUError("No GPU(s) available."),
-        "handlers": [nvidia.NvidiaGPU, AppleSiliconGPU],
+        # Handlers are imported when first requested s.t. e.g. pynvml is not
+        # imported unless GPUs are tracked.
+        "handlers": [
+            "carbontracker.components.gpu.nvidia.NvidiaGPU",
+            "carbontracker.components.apple_silicon.powermetrics.AppleSiliconGPU",
+        ],
     },
     {
         "name": "cpu",
         "error": exceptions.CPUError("No CPU(s) available."),
-        "handlers": [intel.IntelCPU, AppleSiliconCPU],
+        "handlers": [
+            "carbontracker.components.cpu.intel.IntelCPU",
+            "carbontracker.components.apple_silicon.powermetrics.AppleSiliconCPU",
+        ],
     },
 ]
 
 
+COMPONENTS_BY_NAME = {comp["name"]: comp for comp in COMPONENTS}
+
+
 def component_names() -> List[str]:
-    return [comp["name"] for comp in COMPONENTS]
+    return list(COMPONENTS_BY_NAME)
 
 
 def error_by_name(name) -> Exception:
-    for comp in COMPONENTS:
-        if comp["name"] == name:
-            return comp["error"]
-    raise exceptions.ComponentNameError()
+    if name not in COMPONENTS_BY_NAME:
+        raise exceptions.ComponentNameError()
+    return COMPONENTS_BY_NAME[name]["error"]
 
 
 def handlers_by_name(name) -> List[Type[Handler]]:
-    for comp in COMPONENTS:
-        if comp["name"] == name:
-            return comp["handlers"]
-    raise exceptions.ComponentNameError()
+    if name not in COMPONENTS_BY_NAME:
+        raise exceptions.ComponentNameError()
+    return [
+        _import_handler(handler) for handler in COMPONENTS_BY_NAME[name]["handlers"]
+    ]
+
+
+def _import_handler(path: str) -> Type[Handler]:
+    module_name, class_name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 class Component:
-    def __init__(self, name: str, pids: Iterable[int], devices_by_pid: bool):
+    def __init__(
+        self,
+        name: str,
+        pids: Iterable[int],
+        devices_by_pid: bool,
+        include_graphics: bool = False,
+    ):
         self.name = name
         if name not in component_names():
             raise exceptions.ComponentNameError(
                 f"No component found with name '{self.name}'."
             )
         self._handler = self._determine_handler(
-            pids=pids, devices_by_pid=devices_by_pid
+            pids=pids, devices_by_pid=devices_by_pid, include_graphics=include_graphics
         )
-        self.power_usages: List[List[float]] = []
+        # Samples are kept in contiguous arrays of doubles per epoch s.t. long
+        # epochs do not accumulate boxed floats and convert to numpy cheaply.
+        self.power_usages: List[array] = []
         self.cur_epoch: int = -1  # Sentry
 
     @property
@@ -62,11 +83,13 @@ class Component:
         return self._handler
 
     def _determine_handler(
-        self, pids: Iterable[int], devices_by_pid: bool
+        self, pids: Iterable[int], devices_by_pid: bool, **options
     ) -> Union[Handler, None]:
         handlers = handlers_by_name(self.name)
         for h in handlers:
-            handler = h(pids=pids, devices_by_pid=devices_by_pid)
+            # Only pass the options that the handler supports.
+            kwargs = {k: v for k, v in options.items() if k in h.options}
+            handler = h(pids=pids, devices_by_pid=devices_by_pid, **kwargs)
             if handler.available():
                 return handler
         return None
@@ -87,16 +110,20 @@ class Component:
             # update_interval, we copy previous epoch measurements s.t.
             # there exists measurements for every epoch.
             diff = self.cur_epoch - len(self.power_usages) - 1
-            if diff != 0:
-                for _ in range(diff):
-                    # Copy previous measurement lists.
-                    latest_measurements = (
-                        self.power_usages[-1] if self.power_usages else []
-                    )
-                    self.power_usages.append(latest_measurements)
-            self.power_usages.append([])
+            if diff > 0:
+                # Copy previous measurement lists s.t. no two epochs share
+                # the same array.
+                latest_measurements = (
+                    self.power_usages[-1] if self.power_usages else array("d")
+                )
+                self.power_usages.extend(
+                    array("d", latest_measurements) for _ in range(diff)
+                )
+            self.power_usages.append(array("d"))
         try:
-            self.power_usages[-1] += self.handler.power_usage()
+            # Store the total power of all devices s.t. each sample is a
+            # single value and the energy per epoch is one reduction.
+            self.power_usages[-1].append(sum(self.handler.power_usage()))
         except exceptions.IntelRaplPermissionError:
             # Only raise error if no measurements have been collected.
             if not self.power_usages[-1]:
@@ -105,7 +132,7 @@ class Component:
                     "\nSee issue: https://github.com/lfwa/carbontracker/issues/40"
                 )
             # Append zero measurement to avoid further errors.
-            self.power_usages.append([0])
+            self.power_usages.append(array("d", [0]))
         except exceptions.GPUPowerUsageRetrievalError:
             if not self.power_usages[-1]:
                 print(
@@ -113,27 +140,35 @@ class Component:
                     "\nSee issue: https://github.com/lfwa/carbontracker/issues/36"
                 )
                 # Append zero measurement to avoid further errors.
-                self.power_usages.append([0])
+                self.power_usages.append(array("d", [0]))
 
     def energy_usage(self, epoch_times: List[int]) -> List[int]:
-        """Returns energy (mWh) used by component per epoch."""
+        """Returns energy (kWh) used by component per epoch."""
+        n_epochs = min(len(self.power_usages), len(epoch_times))
         energy_usages = []
-        # We have to compute each epoch in a for loop since numpy cannot
-        # handle lists of uneven length.
-        for idx, (power, time) in enumerate(zip(self.power_usages, epoch_times)):
-            # If no power measurement exists, try to use measurements from
-            # later epochs.
-            while not power and idx != len(self.power_usages) - 1:
-                idx += 1
-                power = self.power_usages[idx]
-            if not power:
-                power = [[0]]
-            avg_power_usage = np.mean(power, axis=0)
-            energy_usage = np.multiply(avg_power_usage, time).sum()
-            # Convert from J to kWh.
-            if energy_usage != 0:
-                energy_usage /= 3600000
-            energy_usages.append(energy_usage)
+        if n_epochs > 0:
+            counts = np.fromiter(
+                map(len, self.power_usages), dtype=np.int64, count=len(self.power_usages)
+            )
+            has_power = counts > 0
+            # Sum the samples of all epochs in a single reduction over the
+            # concatenated samples. Empty epochs are left out of reduceat
+            # since it does not handle empty segments.
+            sums = np.zeros(len(counts))
+            if has_power.any():
+                starts = np.cumsum(counts) - counts
+                sums[has_power] = np.add.reduceat(
+                    np.concatenate(self.power_usages), starts[has_power]
+                )
+            # If no power measurement exists, use measurements from the next
+            # epoch that has any. Index len(counts) means none exists.
+            next_idx = np.where(has_power, np.arange(len(counts)), len(counts))
+            next_idx = np.minimum.accumulate(next_idx[::-1])[::-1][:n_epochs]
+            sums = np.append(sums, 0)[next_idx]
+            counts = np.append(counts, 1)[next_idx]
+            # Average power (W) times duration (s) converted from J to kWh.
+            times = np.asarray(epoch_times[:n_epochs], dtype=np.float64)
+            energy_usages = (sums * times / (counts * 3600000)).tolist()
 
         # Ensure energy_usages and epoch_times have same length by
         # copying latest measurement if it exists.
@@ -154,16 +189,29 @@ class Component:
 
 
 def create_components(
-    components: str, pids: Iterable[int], devices_by_pid: bool
+    components: str,
+    pids: Iterable[int],
+    devices_by_pid: bool,
+    include_graphics: bool = False,
 ) -> List[Component]:
     components = components.strip().replace(" ", "").lower()
     if components == "all":
         return [
-            Component(name=comp_name, pids=pids, devices_by_pid=devices_by_pid)
+            Component(
+                name=comp_name,
+                pids=pids,
+                devices_by_pid=devices_by_pid,
+                include_graphics=include_graphics,
+            )
             for comp_name in component_names()
         ]
     else:
         return [
-            Component(name=comp_name, pids=pids, devices_by_pid=devices_by_pid)
+            Component(
+                name=comp_name,
+                pids=pids,
+                devices_by_pid=devices_by_pid,
+                include_graphics=include_graphics,
+            )
             for comp_name in components.split(",")
         ]
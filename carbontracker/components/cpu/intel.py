@@ -4,7 +4,7 @@ import time
 
 from carbontracker import exceptions
 from carbontracker.components.handler import Handler
-from typing import List, Union
+from typing import Dict, List, TextIO, Union
 
 # RAPL Literature:
 # https://www.researchgate.net/publication/322308215_RAPL_in_Action_Experiences_in_Using_RAPL_for_Power_Measurements
@@ -13,52 +13,89 @@ RAPL_DIR = "/sys/class/powercap/"
 CPU = 0
 DRAM = 2
 MEASURE_DELAY = 1
+_PARTS_PATTERN = re.compile(r"intel-rapl:(\d):(\d)")
+_DEVICES_PATTERN = re.compile("intel-rapl:.")
 
 
 class IntelCPU(Handler):
     def __init__(self, pids: List, devices_by_pid: bool):
         super().__init__(pids, devices_by_pid)
         self._handler = None
+        self._last_measurements: Union[None, List[int]] = None
+        self._last_measure_time: Union[None, float] = None
+        # Parts of packages without a total energy_uj. RAPL topology does not
+        # change, so each package is only listed once.
+        self._parts_by_package: Dict[str, List[str]] = {}
+        # energy_uj files are kept open and reread from the start s.t. a
+        # sample does not open and close every file.
+        self._energy_files: Dict[str, TextIO] = {}
 
     def devices(self) -> List[str]:
         """Returns the name of all RAPL Domains"""
         return self._devices
 
     def available(self) -> bool:
-        return os.path.exists(RAPL_DIR) and bool(os.listdir(RAPL_DIR))
+        # A missing RAPL_DIR makes listdir fail, so a separate exists check is
+        # not needed.
+        try:
+            return bool(os.listdir(RAPL_DIR))
+        except OSError:
+            return False
 
     def power_usage(self) -> List[float]:
-        before_measures = self._get_measurements()
-        time.sleep(MEASURE_DELAY)
+        """Returns the avg. power usage since the previous call. The first call
+        blocks for MEASURE_DELAY seconds to get an initial sample."""
+        if self._last_measurements is None:
+            before_measures = self._get_measurements()
+            time.sleep(MEASURE_DELAY)
+            duration = MEASURE_DELAY
+        else:
+            before_measures = self._last_measurements
+            duration = time.monotonic() - self._last_measure_time
         after_measures = self._get_measurements()
-        # Ensure all power measurements >= 0 and retry up to 3 times.
-        attempts = 3
-        while attempts > 0:
-            attempts -= 1
-            power_usages = [
-                self._compute_power(before, after)
-                for before, after in zip(before_measures, after_measures)
-            ]
-            if all(power >= 0 for power in power_usages):
-                return power_usages
+        self._last_measurements = after_measures
+        self._last_measure_time = time.monotonic()
+
+        power_usages = [
+            self._compute_power(before, after, duration)
+            for before, after in zip(before_measures, after_measures)
+        ]
+        # Energy counters may wrap around between samples.
+        if duration > 0 and all(power >= 0 for power in power_usages):
+            return power_usages
         default = [0.0 for device in range(len(self._devices))]
         return default
 
-    def _compute_power(self, before: int, after: int) -> float:
-        """Compute avg. power usage from two samples in microjoules."""
+    def _compute_power(
+        self, before: int, after: int, duration: float = MEASURE_DELAY
+    ) -> float:
+        """Compute avg. power usage from two samples in microjoules taken
+        duration seconds apart."""
         joules = (after - before) / 1000000
-        watt = joules / MEASURE_DELAY
+        watt = joules / duration
         return watt
 
     def _read_energy(self, path: str) -> int:
-        with open(os.path.join(path, "energy_uj"), "r") as f:
-            return int(f.read())
+        f = self._energy_files.get(path)
+        if f is None:
+            f = open(os.path.join(path, "energy_uj"), "r")
+            self._energy_files[path] = f
+        f.seek(0)
+        return int(f.read())
+
+    def _close_energy_files(self):
+        for f in self._energy_files.values():
+            f.close()
+        self._energy_files = {}
 
     def _get_measurements(self):
         measurements = []
         for package in self._rapl_devices:
             try:
-                power_usage = self._read_energy(os.path.join(RAPL_DIR, package))
+                if package in self._parts_by_package:
+                    power_usage = self._read_parts_energy(package)
+                else:
+                    power_usage = self._read_energy(os.path.join(RAPL_DIR, package))
                 measurements.append(power_usage)
             # If there is no sudo access, we cannot read the energy_uj file.
             # Permission denied error is raised.
@@ -67,43 +104,46 @@ class IntelCPU(Handler):
 
             except FileNotFoundError:
                 # check cpu/gpu/dram
-                parts = [
+                self._parts_by_package[package] = [
                     f
                     for f in os.listdir(os.path.join(RAPL_DIR, package))
-                    if re.match(self.parts_pattern, f)
+                    if self.parts_pattern.match(f)
                 ]
-                total_power_usage = 0
-                for part in parts:
-                    total_power_usage += self._read_energy(
-                        os.path.join(RAPL_DIR, package, part)
-                    )
-
-                measurements.append(total_power_usage)
+                measurements.append(self._read_parts_energy(package))
 
         return measurements
 
+    def _read_parts_energy(self, package: str) -> int:
+        total_power_usage = 0
+        for part in self._parts_by_package[package]:
+            total_power_usage += self._read_energy(os.path.join(RAPL_DIR, package, part))
+        return total_power_usage
+
     def _convert_rapl_name(self, name, pattern) -> Union[None, str]:
-        if re.match(pattern, name):
+        if pattern.match(name):
             return "cpu:" + name[-1]
 
     def init(self):
+        self._last_measurements = None
+        self._last_measure_time = None
+        self._parts_by_package = {}
+        self._close_energy_files()
         # Get amount of intel-rapl folders
         packages = list(filter(lambda x: ":" in x, os.listdir(RAPL_DIR)))
         self.device_count = len(packages)
         self._devices: List[str] = []
         self._rapl_devices: List[str] = []
-        self.parts_pattern = re.compile(r"intel-rapl:(\d):(\d)")
-        devices_pattern = re.compile("intel-rapl:.")
+        self.parts_pattern = _PARTS_PATTERN
 
         for package in packages:
-            if re.fullmatch(devices_pattern, package):
+            if _DEVICES_PATTERN.fullmatch(package):
                 with open(os.path.join(RAPL_DIR, package, "name"), "r") as f:
                     name = f.read().strip()
                 if name != "psys":
                     self._rapl_devices.append(package)
-                    rapl_name = self._convert_rapl_name(package, devices_pattern)
+                    rapl_name = self._convert_rapl_name(package, _DEVICES_PATTERN)
                     if rapl_name is not None:
                         self._devices.append(rapl_name)
 
     def shutdown(self):
-        pass
+        self._close_energy_files()
@@ -15,26 +15,56 @@ import os
 
 from carbontracker import exceptions
 from carbontracker.components.handler import Handler
-from typing import List, Union
+from typing import Dict, List, Set, Union
+
+# Environment variables listing the GPUs of a job in order of precedence.
+GPU_INDICES_ENV_VARS = ("CUDA_VISIBLE_DEVICES", "SLURM_JOB_GPUS", "GPU_DEVICE_ORDINAL")
+# Union field of c_nvmlValue_t holding a sample of the given value type.
+_SAMPLE_VALUE_FIELDS = {
+    pynvml.NVML_VALUE_TYPE_DOUBLE: "dVal",
+    pynvml.NVML_VALUE_TYPE_UNSIGNED_INT: "uiVal",
+    pynvml.NVML_VALUE_TYPE_UNSIGNED_LONG: "ulVal",
+    pynvml.NVML_VALUE_TYPE_UNSIGNED_LONG_LONG: "ullVal",
+    pynvml.NVML_VALUE_TYPE_SIGNED_LONG_LONG: "sllVal",
+    pynvml.NVML_VALUE_TYPE_SIGNED_INT: "siVal",
+    pynvml.NVML_VALUE_TYPE_UNSIGNED_SHORT: "usVal",
+}
 
 
 class NvidiaGPU(Handler):
-    def __init__(self, pids: List[int], devices_by_pid: bool):
+    options = ("include_graphics",)
+
+    def __init__(
+        self, pids: List[int], devices_by_pid: bool, include_graphics: bool = False
+    ):
         super().__init__(pids, devices_by_pid)
+        self.include_graphics = include_graphics
+        self._pid_set = frozenset(pids)
         self._handles = []
+        self._initialized = False
+        self._device_names: Union[None, List[str]] = None
+        # Timestamp of the latest driver power sample read per handle index
+        # and indices of handles that do not support power samples.
+        self._last_sample_ts: Dict[int, int] = {}
+        self._samples_unsupported: Set[int] = set()
 
     def devices(self) -> List[str]:
         """
         Note:
             Requires NVML to be initialized.
         """
-        names = [pynvml.nvmlDeviceGetName(handle) for handle in self._handles]
+        # Names do not change for a handle, so they are only queried once per
+        # NVML session.
+        if self._device_names is None:
+            names = [pynvml.nvmlDeviceGetName(handle) for handle in self._handles]
+
+            # Decode names if Python version is less than 3.9
+            if sys.version_info < (3, 10):
+                names = [name.decode() for name in names]
 
-        # Decode names if Python version is less than 3.9
-        if sys.version_info < (3, 10):
-            names = [name.decode() for name in names]
+            self._device_names = names
 
-        return names
+        return self._device_names
 
     def available(self) -> bool:
         """Checks if NVML and any GPUs are available."""
@@ -50,32 +80,75 @@ class NvidiaGPU(Handler):
         return available
 
     def power_usage(self) -> List[float]:
-        """Retrieves instantaneous power usages (W) of all GPUs in a list.
+        """Retrieves power usages (W) of all GPUs in a list. Uses the avg. of
+        the power samples buffered by the driver since the previous call and
+        otherwise the instantaneous power usage.
 
         Note:
             Requires NVML to be initialized.
+            On WSL2, nvmlDeviceGetUtilizationRates fails with
+            NVML_ERROR_UNKNOWN unless a power or clock query precedes it in
+            the same cycle. Any utilization query added to this handler must
+            therefore run after the power queries here.
         """
         gpu_power_usages = []
 
-        for handle in self._handles:
+        for index, handle in enumerate(self._handles):
             try:
-                # Retrieves power usage in mW, divide by 1000 to get in W.
-                power_usage = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000
+                power_usage = self._sampled_power_usage(index, handle)
+                if power_usage is None:
+                    # Retrieves power usage in mW, divide by 1000 to get in W.
+                    power_usage = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000
                 gpu_power_usages.append(power_usage)
             except pynvml.NVMLError:
                 raise exceptions.GPUPowerUsageRetrievalError()
         return gpu_power_usages
 
+    def _sampled_power_usage(self, index: int, handle) -> Union[None, float]:
+        """Returns the avg. power usage (W) of the driver's power samples since
+        the previous call or None if there are none."""
+        if index in self._samples_unsupported:
+            return None
+        try:
+            value_type, samples = pynvml.nvmlDeviceGetSamples(
+                handle,
+                pynvml.NVML_TOTAL_POWER_SAMPLES,
+                self._last_sample_ts.get(index, 0),
+            )
+        except pynvml.NVMLError as e:
+            # Consumer GPUs often do not support power samples.
+            if e.value == pynvml.NVML_ERROR_NOT_SUPPORTED:
+                self._samples_unsupported.add(index)
+            return None
+        if not samples:
+            return None
+
+        self._last_sample_ts[index] = max(sample.timeStamp for sample in samples)
+        field = _SAMPLE_VALUE_FIELDS[value_type]
+        # Samples are in mW, divide by 1000 to get in W.
+        total = sum(getattr(sample.sampleValue, field) for sample in samples)
+        return total / len(samples) / 1000
+
     def init(self):
+        if self._initialized:
+            return
         pynvml.nvmlInit()
         if self.devices_by_pid:
             self._handles = self._get_handles_by_pid()
         else:
             self._handles = self._get_handles()
+        self._device_names = None
+        self._last_sample_ts = {}
+        self._samples_unsupported = set()
+        self._initialized = True
 
     def shutdown(self):
         pynvml.nvmlShutdown()
         self._handles = []
+        self._device_names = None
+        self._last_sample_ts = {}
+        self._samples_unsupported = set()
+        self._initialized = False
 
     def _get_handles(self) -> List:
         """Returns handles of GPUs in slurm job if existent otherwise all
@@ -94,20 +167,30 @@ class NvidiaGPU(Handler):
 
         Note:
             Relies on the environment variable CUDA_VISIBLE_DEVICES to not
-            overwritten. Alternative variables could be SLURM_JOB_GPUS and
-            GPU_DEVICE_ORDINAL.
+            overwritten. Falls back to SLURM_JOB_GPUS and GPU_DEVICE_ORDINAL.
+            Devices may be given by index or by UUID, which requires NVML to
+            be initialized.
         """
-        index_str = os.environ.get("CUDA_VISIBLE_DEVICES")
+        for var in GPU_INDICES_ENV_VARS:
+            index_str = os.environ.get(var)
+            if index_str is not None:
+                break
+        else:
+            return None
+
         try:
-            indices = (
-                [int(i) for i in index_str.split(",")]
-                if index_str is not None
-                else None
-            )
-        except:
+            indices = [self._device_index(i.strip()) for i in index_str.split(",")]
+        except (ValueError, pynvml.NVMLError):
             indices = None
         return indices
 
+    def _device_index(self, device: str) -> int:
+        """Returns the NVML index of a device given by index or UUID."""
+        if device.startswith(("GPU-", "MIG-")):
+            handle = pynvml.nvmlDeviceGetHandleByUUID(device)
+            return pynvml.nvmlDeviceGetIndex(handle)
+        return int(device)
+
     def _get_handles_by_pid(self) -> List:
         """Returns handles of GPU running at least one process from PIDS.
 
@@ -122,13 +205,19 @@ class NvidiaGPU(Handler):
 
         for index in range(device_count):
             handle = pynvml.nvmlDeviceGetHandleByIndex(index)
-            gpu_pids = [
-                p.pid
+            # Training workloads only create compute contexts. Graphics
+            # processes are only queried if requested and no compute process
+            # matched as each query is a separate driver call.
+            if any(
+                p.pid in self._pid_set
                 for p in pynvml.nvmlDeviceGetComputeRunningProcesses(handle)
-                + pynvml.nvmlDeviceGetGraphicsRunningProcesses(handle)
-            ]
-
-            if set(gpu_pids).intersection(self.pids):
+            ) or (
+                self.include_graphics
+                and any(
+                    p.pid in self._pid_set
+                    for p in pynvml.nvmlDeviceGetGraphicsRunningProcesses(handle)
+                )
+            ):
                 devices.append(handle)
 
         return devices
@@ -1,10 +1,13 @@
 from abc import ABCMeta, abstractmethod
-from typing import List, Iterable
+from typing import List, Iterable, Tuple
 
 
 class Handler:
     __metaclass__ = ABCMeta
 
+    # Names of handler-specific keyword arguments accepted by __init__.
+    options: Tuple[str, ...] = ()
+
     def __init__(self, pids: Iterable[int], devices_by_pid: bool):
         self.pids = pids
         self.devices_by_pid = devices_by_pid
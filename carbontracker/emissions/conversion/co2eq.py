@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import os
 
@@ -5,13 +6,17 @@ here = os.path.abspath(os.path.dirname(__file__))
 conversion_file = os.path.join(here, "co2eq.csv")
 CONVERSION_DF = pd.read_csv(conversion_file)
 
+# Use latest conversion factors. Extracted once s.t. convert only does array
+# arithmetic.
+_LATEST_DF = CONVERSION_DF.iloc[-1:]
+_GCO2EQ_PER_UNIT = _LATEST_DF["gCO2eq_per_unit"].to_numpy(dtype=np.float64)
+_LOWERBOUNDS = _LATEST_DF["lowerbound"].to_numpy(dtype=np.float64)
+_UPPERBOUNDS = _LATEST_DF["upperbound"].to_numpy(dtype=np.float64)
+_UNITS = np.array(_LATEST_DF["unit"].tolist(), dtype=object)
+
 
 def convert(g_co2eq):
     """Converts gCO2eq to all units in range specified by CONVERSION_FILE."""
-    conversions = []
-    df = CONVERSION_DF.iloc[-1:]  # Use latest conversion factors
-    converters = df.loc[(df["lowerbound"] <= g_co2eq) & (df["upperbound"] >= g_co2eq)]
-    for _, converter in converters.iterrows():
-        units = g_co2eq / converter["gCO2eq_per_unit"]
-        conversions.append((units, converter["unit"]))
-    return conversions
+    in_range = (_LOWERBOUNDS <= g_co2eq) & (_UPPERBOUNDS >= g_co2eq)
+    units = g_co2eq / _GCO2EQ_PER_UNIT[in_range]
+    return list(zip(units.tolist(), _UNITS[in_range].tolist()))
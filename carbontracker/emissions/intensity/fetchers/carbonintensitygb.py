@@ -1,13 +1,22 @@
 import requests
 import datetime
-
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from carbontracker import exceptions
 from carbontracker.emissions.intensity.fetcher import IntensityFetcher
 from carbontracker.emissions.intensity import intensity
 
 API_URL = "https://api.carbonintensity.org.uk"
+DATE_FORMAT = "%Y-%m-%dT%H:%MZ"
+# (connect, read) timeouts in seconds.
+TIMEOUT = (2, 5)
+# Seconds to wait for the regional query before also starting the national
+# fallback query.
+NATIONAL_FALLBACK_DELAY = 1.0
+
+# Shared s.t. repeated queries reuse the keep-alive connection instead of
+# doing a new TCP and TLS handshake each time.
+_SESSION = requests.Session()
 
 
 class CarbonIntensityGB(IntensityFetcher):
@@ -20,11 +29,29 @@ class CarbonIntensityGB(IntensityFetcher):
         if time_dur is not None:
             carbon_intensity.is_prediction = True
 
+        # Only start the national query if the regional one fails or is slow
+        # s.t. the common case costs a single request.
+        executor = ThreadPoolExecutor(max_workers=2)
         try:
-            postcode = g_location.postal
-            ci = self._carbon_intensity_gb_regional(postcode, time_dur=time_dur)
-        except:
-            ci = self._carbon_intensity_gb_national(time_dur=time_dur)
+            regional = executor.submit(
+                lambda: self._carbon_intensity_gb_regional(
+                    g_location.postal, time_dur=time_dur
+                )
+            )
+            done, _ = wait([regional], timeout=NATIONAL_FALLBACK_DELAY)
+            if done and regional.exception() is None:
+                ci = regional.result()
+            else:
+                national = executor.submit(
+                    self._carbon_intensity_gb_national, time_dur=time_dur
+                )
+                try:
+                    ci = regional.result()
+                except Exception:
+                    ci = national.result()
+        finally:
+            # Do not wait for a query whose result is no longer needed.
+            executor.shutdown(wait=False)
 
         carbon_intensity.carbon_intensity = ci
 
@@ -40,7 +67,7 @@ class CarbonIntensityGB(IntensityFetcher):
             url += f"/intensity/{from_str}/{to_str}"
 
         url += f"/postcode/{postcode}"
-        response = requests.get(url)
+        response = _SESSION.get(url, timeout=TIMEOUT)
         if not response.ok:
             raise exceptions.CarbonIntensityFetcherError(response.json())
         data = response.json()["data"]
@@ -52,7 +79,9 @@ class CarbonIntensityGB(IntensityFetcher):
         carbon_intensities = []
         for ci in data["data"]:
             carbon_intensities.append(ci["intensity"]["forecast"])
-        carbon_intensity = np.mean(carbon_intensities)
+        if not carbon_intensities:
+            raise exceptions.CarbonIntensityFetcherError(data)
+        carbon_intensity = sum(carbon_intensities) / len(carbon_intensities)
 
         return carbon_intensity
 
@@ -64,7 +93,7 @@ class CarbonIntensityGB(IntensityFetcher):
             from_str, to_str = self._time_from_to_str(time_dur)
             url += f"/{from_str}/{to_str}"
 
-        response = requests.get(url)
+        response = _SESSION.get(url, timeout=TIMEOUT)
         if not response.ok:
             raise exceptions.CarbonIntensityFetcherError(response.json())
         carbon_intensity = response.json()["data"][0]["intensity"]["forecast"]
@@ -73,9 +102,8 @@ class CarbonIntensityGB(IntensityFetcher):
     def _time_from_to_str(self, time_dur):
         """Returns the current date in UTC (from) and time_dur seconds ahead
         (to) in ISO8601 format YYYY-MM-DDThh:mmZ."""
-        date_format = "%Y-%m-%dT%H:%MZ"
         time_from = datetime.datetime.now(datetime.timezone.utc)
         time_to = time_from + datetime.timedelta(seconds=time_dur)
-        from_str = time_from.strftime(date_format)
-        to_str = time_to.strftime(date_format)
+        from_str = time_from.strftime(DATE_FORMAT)
+        to_str = time_to.strftime(DATE_FORMAT)
         return from_str, to_str
@@ -6,10 +6,18 @@ from carbontracker.emissions.intensity import intensity
 from carbontracker.loggerutil import Logger
 
 API_URL = "https://api-access.electricitymaps.com/free-tier/carbon-intensity/latest"
+# (connect, read) timeouts in seconds.
+TIMEOUT = (2, 5)
+
+# Shared s.t. repeated queries reuse the keep-alive connection instead of
+# doing a new TCP and TLS handshake each time.
+_SESSION = requests.Session()
 
 
 class ElectricityMap(IntensityFetcher):
     _api_key = None
+    # Request headers built once when the key is set.
+    _headers = None
 
     def __init__(self, logger: Logger):
         self.logger = logger
@@ -17,6 +25,7 @@ class ElectricityMap(IntensityFetcher):
     @classmethod
     def set_api_key(cls, key):
         cls._api_key = key
+        cls._headers = {"auth-token": key}
 
     def suitable(self, g_location):
         has_key = self._api_key is not None
@@ -29,7 +38,7 @@ class ElectricityMap(IntensityFetcher):
 
         try:
             ci = self._carbon_intensity_by_location(lon=g_location.lng, lat=g_location.lat)
-        except:
+        except Exception:
             ci = self._carbon_intensity_by_location(zone=g_location.country)
 
         carbon_intensity.carbon_intensity = ci
@@ -51,15 +60,15 @@ class ElectricityMap(IntensityFetcher):
             Carbon intensity in gCO2eq/kWh.
         """
         if zone is not None:
-            params = (("zone", zone),)
+            params = {"zone": zone}
             assert lon is None and lat is None
         elif lon is not None and lat is not None:
-            params = (("lon", lon), ("lat", lat))
+            params = {"lon": lon, "lat": lat}
             assert zone is None
 
-        headers = {"auth-token": self._api_key}
-
-        response = requests.get(API_URL, headers=headers, params=params)
+        response = _SESSION.get(
+            API_URL, headers=self._headers, params=params, timeout=TIMEOUT
+        )
         if not response.ok:
             raise exceptions.CarbonIntensityFetcherError(response.json())
         carbon_intensity = response.json()["carbonIntensity"]
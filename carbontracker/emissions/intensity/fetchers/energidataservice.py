@@ -1,12 +1,26 @@
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-import numpy as np
 
 from carbontracker import exceptions
 from carbontracker.emissions.intensity.fetcher import IntensityFetcher
 from carbontracker.emissions.intensity import intensity
 
+CURRENT_URL = (
+    'https://api.energidataservice.dk/dataset/CO2emis?filter={{"PriceArea":"{area}"}}'
+)
+PROGNOSIS_URL = (
+    "https://api.energidataservice.dk/dataset/CO2Emis?start={start}&end={end}&limit=4"
+)
+DATE_FORMAT = "%Y-%m-%dT%H:%M"
+# (connect, read) timeouts in seconds.
+TIMEOUT = (2, 5)
+
+# Shared s.t. repeated queries reuse the keep-alive connections instead of
+# doing a new TCP and TLS handshake each time.
+_SESSION = requests.Session()
+
 
 class EnergiDataService(IntensityFetcher):
     def suitable(self, g_location):
@@ -25,39 +39,38 @@ class EnergiDataService(IntensityFetcher):
         return carbon_intensity
 
     def _emission_current(self):
-        def url_creator(area):
-            return (
-                'https://api.energidataservice.dk/dataset/CO2emis?filter={"PriceArea":"'
-                + area
-                + '"}'
-            )
-
         areas = ["DK1", "DK2"]
         carbon_intensities = []
 
-        for area in areas:
-            url = url_creator(area)
-            response = requests.get(url)
+        # Query both price areas concurrently s.t. we only wait for one
+        # round-trip.
+        with ThreadPoolExecutor(max_workers=len(areas)) as executor:
+            responses = list(
+                executor.map(
+                    lambda area: _SESSION.get(
+                        CURRENT_URL.format(area=area), timeout=TIMEOUT
+                    ),
+                    areas,
+                )
+            )
+
+        for response in responses:
             if not response.ok:
                 raise exceptions.CarbonIntensityFetcherError(response.json())
             carbon_intensities.append(response.json()["records"][0]["CO2Emission"])
-        return np.mean(carbon_intensities)
+        return sum(carbon_intensities) / len(carbon_intensities)
 
     def _emission_prognosis(self, time_dur):
         from_str, to_str = self._interval(time_dur=time_dur)
-        url = (
-            "https://api.energidataservice.dk/dataset/CO2Emis?start="
-            + from_str
-            + "&end="
-            + to_str
-            + "&limit=4"
-        )
-        response = requests.get(url)
+        url = PROGNOSIS_URL.format(start=from_str, end=to_str)
+        response = _SESSION.get(url, timeout=TIMEOUT)
         if not response.ok:
             raise exceptions.CarbonIntensityFetcherError(response.json())
         data = response.json()["records"]
         carbon_intensities = [record["CO2Emission"] for record in data]
-        return np.mean(carbon_intensities)
+        if not carbon_intensities:
+            raise exceptions.CarbonIntensityFetcherError(data)
+        return sum(carbon_intensities) / len(carbon_intensities)
 
     def _interval(self, time_dur):
         from_time = datetime.datetime.now(datetime.timezone.utc)
@@ -67,8 +80,7 @@ class EnergiDataService(IntensityFetcher):
         return from_str, to_str
 
     def _nearest_5_min(self, time):
-        date_format = "%Y-%m-%dT%H:%M"
         nearest_5_min = time - datetime.timedelta(
             minutes=time.minute % 5, seconds=time.second, microseconds=time.microsecond
         )
-        return nearest_5_min.strftime(date_format)
+        return nearest_5_min.strftime(DATE_FORMAT)
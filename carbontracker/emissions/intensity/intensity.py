@@ -1,11 +1,13 @@
+import functools
 import os.path
+import time
 import traceback
 
 import geocoder
 import numpy as np
 import pandas as pd
 import sys
-from typing import Union
+from typing import Tuple, Union
 
 from carbontracker import loggerutil
 from carbontracker import exceptions
@@ -16,18 +18,9 @@ from carbontracker.emissions.intensity.fetchers import electricitymaps
 from carbontracker.emissions.intensity.location import Location
 
 
-def get_default_intensity():
-    """Retrieve static default carbon intensity value based on location."""
-    try:
-        g_location: Location = geocoder.ip("me")
-        if not g_location.ok:
-            raise exceptions.IPLocationError("Failed to retrieve location based on IP.")
-        address = g_location.address
-        country = g_location.country
-    except Exception as err:
-        address = "Unknown"
-        country = "Unknown"
-
+def _average_intensity(country) -> Tuple[float, str]:
+    """Returns the average carbon intensity of country (alpha-2 code) from the
+    bundled table and its description. Defaults to the world average."""
     try:
         # importlib.resources.files was introduced in Python 3.9
         if sys.version_info < (3, 9):
@@ -52,7 +45,22 @@ def get_default_intensity():
     except Exception as err:
         intensity = constants.WORLD_2019_CARBON_INTENSITY
         description = f"Defaulted to average carbon intensity for world in 2019 of {intensity:.2f} gCO2/kWh."
+    return intensity, description
+
 
+def get_default_intensity():
+    """Retrieve static default carbon intensity value based on location."""
+    try:
+        g_location: Location = geocoder.ip("me")
+        if not g_location.ok:
+            raise exceptions.IPLocationError("Failed to retrieve location based on IP.")
+        address = g_location.address
+        country = g_location.country
+    except Exception as err:
+        address = "Unknown"
+        country = "Unknown"
+
+    intensity, description = _average_intensity(country)
     description = (
         f"Live carbon intensity could not be fetched at detected location: {address}. "
         + description
@@ -60,11 +68,55 @@ def get_default_intensity():
     default_intensity = {
         "carbon_intensity": intensity,
         "description": description,
+        "address": address,
     }
     return default_intensity
 
 
-default_intensity = get_default_intensity()
+# Looked up on first use s.t. importing carbontracker does not geolocate.
+default_intensity: Union[None, dict] = None
+
+
+def _default_intensity() -> dict:
+    global default_intensity
+    if default_intensity is None:
+        default_intensity = get_default_intensity()
+    return default_intensity
+
+
+@functools.lru_cache(maxsize=None)
+def get_offline_intensity(country=None):
+    """Retrieve static carbon intensity value used in offline mode. No
+    location lookup is made, so the country (alpha-2 code) must be given to
+    use its average. Otherwise, the world average is used."""
+    intensity, description = _average_intensity(country and country.upper())
+    return {
+        "carbon_intensity": intensity,
+        "description": "Offline mode: live carbon intensity is not fetched. "
+        + description,
+    }
+
+
+# Seconds for which a successful IP-based location lookup is reused.
+LOCATION_TTL = 3600
+
+# Latest successful location lookup as (expiry time, location). Replaced as a
+# whole s.t. concurrent fetches always see a consistent pair.
+_cached_location: Union[None, Tuple[float, Location]] = None
+
+
+def _ip_location() -> Location:
+    """Returns the location based on IP. Lookups are reused for LOCATION_TTL
+    seconds as the location does not change during training."""
+    global _cached_location
+    cached = _cached_location
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+    g_location = geocoder.ip("me")
+    if not g_location.ok:
+        raise exceptions.IPLocationError("Failed to retrieve location based on IP.")
+    _cached_location = (time.monotonic() + LOCATION_TTL, g_location)
+    return g_location
 
 
 class CarbonIntensity:
@@ -77,6 +129,7 @@ class CarbonIntensity:
         success=False,
         is_prediction=False,
         default=False,
+        offline=False,
     ):
         self.carbon_intensity = carbon_intensity
         self.g_location = g_location
@@ -84,6 +137,7 @@ class CarbonIntensity:
         self.message = message
         self.success = success
         self.is_prediction = is_prediction
+        self.offline = offline
         if default:
             self.set_as_default()
 
@@ -91,14 +145,30 @@ class CarbonIntensity:
         self.set_default_intensity()
         self.set_default_message()
 
+    def _default(self) -> dict:
+        if self.offline:
+            # offline is either True or the country given for offline mode.
+            country = self.offline if isinstance(self.offline, str) else None
+            return get_offline_intensity(country)
+        return _default_intensity()
+
     def set_default_intensity(self):
-        self.carbon_intensity = default_intensity["carbon_intensity"]
+        self.carbon_intensity = self._default()["carbon_intensity"]
 
     def set_default_message(self):
-        self.message = default_intensity["description"]
+        self.message = self._default()["description"]
+
 
+def carbon_intensity(
+    logger, time_dur=None, fetchers=None, offline=False, g_location=None
+):
+    """Fetches the carbon intensity at g_location. The location is looked up
+    based on IP if not given. If offline is set, no network requests are made
+    and the average carbon intensity of the country given by offline (alpha-2
+    code) is used, or the world average if offline is True."""
+    if offline:
+        return CarbonIntensity(default=True, offline=offline)
 
-def carbon_intensity(logger, time_dur=None, fetchers=None):
     if fetchers is None:
         fetchers = [
             electricitymaps.ElectricityMap(logger=logger),
@@ -109,11 +179,10 @@ def carbon_intensity(logger, time_dur=None, fetchers=None):
     carbon_intensity = CarbonIntensity(default=True)
 
     try:
-        g_location = geocoder.ip("me")
-        if not g_location.ok:
-            raise exceptions.IPLocationError("Failed to retrieve location based on IP.")
+        if g_location is None:
+            g_location = _ip_location()
         carbon_intensity.address = g_location.address
-    except:
+    except Exception:
         err_str = traceback.format_exc()
         logger.err_info(err_str)
         return carbon_intensity
@@ -127,14 +196,14 @@ def carbon_intensity(logger, time_dur=None, fetchers=None):
                 carbon_intensity.success = True
                 set_carbon_intensity_message(carbon_intensity, time_dur)
             carbon_intensity.address = g_location.address
-        except:
+        except Exception:
             err_str = traceback.format_exc()
             logger.err_info(err_str)
 
     if not carbon_intensity.success:
         logger.err_warn(
             "Failed to retrieve carbon intensity: Defaulting to average carbon intensity {} gCO2/kWh.".format(
-                default_intensity["carbon_intensity"]
+                _default_intensity()["carbon_intensity"]
             )
         )
     return carbon_intensity
@@ -161,5 +230,6 @@ def set_carbon_intensity_message(ci: CarbonIntensity, time_dur):
             )
         else:
             ci.set_default_message()
-    if ci.message is not None:
+    # The location is not looked up in offline mode.
+    if ci.message is not None and not ci.offline:
         ci.message += f" at detected location: {ci.address}."
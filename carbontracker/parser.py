@@ -6,6 +6,29 @@ import numpy as np
 from carbontracker import exceptions
 from typing import Dict, Union, List
 
+# Patterns are compiled once since they are applied to every log file.
+_ACTUAL_RE = re.compile(
+    r"(?i)Actual consumption"
+    r"(?:\s*for\s+\d+\s+epochs)?"
+    r"[\s\S]*?Time:\s*(.*)\n\s*Energy:\s*(.*)\s+kWh"
+    r"[\s\S]*?CO2eq:\s*(.*)\s+g"
+    r"(?:\s*This is equivalent to:\s*([\s\S]*?))?(?=\d{4}-\d{2}-\d{2}|\Z)"
+)
+_PRED_RE = re.compile(
+    r"(?i)Predicted consumption for (\d*) epoch\(s\):"
+    r"[\s\S]*?Time:\s*(.*)\n\s*Energy:\s*(.*)\s+kWh"
+    r"[\s\S]*?CO2eq:\s*(.*)\s+g"
+    r"(?:\s*This is equivalent to:\s*([\s\S]*?))?(?=\d{4}-\d{2}-\d{2}|\Z)"
+)
+_EARLY_STOP_RE = re.compile(r"(?i)Training was interrupted")
+_TIME_RE = re.compile(r"(\d+):(\d{2}):(\d\d?(?:.\d{2})?)")
+_OUTPUT_LOG_RE = re.compile(r".*carbontracker_output.log")
+_STD_LOG_RE = re.compile(r".*carbontracker.log")
+_COMPONENTS_RE = re.compile(r"The following components were found:(.*)\n")
+_DEVICE_RE = re.compile(r" (.*?) with device\(s\) (.*?)\.")
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d{2}):(\d\d?(?:.\d{2})?)")
+_POWER_RE = re.compile(r"Average power usage \(W\) for (.+): (\[?[0-9\.]+\]?|None)")
+
 
 def parse_all_logs(log_dir):
     """
@@ -133,30 +156,15 @@ def get_consumption(output_log_data: str):
                     "equivalents": equivalents,
                 }
     """
-    actual_re = re.compile(
-        r"(?i)Actual consumption"
-        r"(?:\s*for\s+\d+\s+epochs)?"
-        r"[\s\S]*?Time:\s*(.*)\n\s*Energy:\s*(.*)\s+kWh"
-        r"[\s\S]*?CO2eq:\s*(.*)\s+g"
-        r"(?:\s*This is equivalent to:\s*([\s\S]*?))?(?=\d{4}-\d{2}-\d{2}|\Z)"
-    )
-    pred_re = re.compile(
-        r"(?i)Predicted consumption for (\d*) epoch\(s\):"
-        r"[\s\S]*?Time:\s*(.*)\n\s*Energy:\s*(.*)\s+kWh"
-        r"[\s\S]*?CO2eq:\s*(.*)\s+g"
-        r"(?:\s*This is equivalent to:\s*([\s\S]*?))?(?=\d{4}-\d{2}-\d{2}|\Z)"
-    )
-    actual_match = re.search(actual_re, output_log_data)
-    pred_match = re.search(pred_re, output_log_data)
+    actual_match = _ACTUAL_RE.search(output_log_data)
+    pred_match = _PRED_RE.search(output_log_data)
     actual = extract_measurements(actual_match)
     pred = extract_measurements(pred_match)
     return actual, pred
 
 
 def get_early_stop(std_log_data: str) -> bool:
-    early_stop_re = re.compile(r"(?i)Training was interrupted")
-    early_stop = re.findall(early_stop_re, std_log_data)
-    return bool(early_stop)
+    return _EARLY_STOP_RE.search(std_log_data) is not None
 
 def extract_measurements(match):
     if not match:
@@ -178,8 +186,7 @@ def extract_measurements(match):
 
 
 def get_time(time_str: str) -> Union[float, None]:
-    duration_re = re.compile(r"(\d+):(\d{2}):(\d\d?(?:.\d{2})?)")
-    match = re.search(duration_re, time_str)
+    match = _TIME_RE.search(time_str)
     if not match:
         return None
     match = match.groups()
@@ -315,10 +322,8 @@ def get_all_logs(log_dir):
         if os.path.isfile(os.path.join(log_dir, f))
         and os.path.getsize(os.path.join(log_dir, f)) > 0
     ]
-    output_re = re.compile(r".*carbontracker_output.log")
-    std_re = re.compile(r".*carbontracker.log")
-    output_logs = sorted(list(filter(output_re.match, files)))
-    std_logs = sorted(list(filter(std_re.match, files)))
+    output_logs = sorted(filter(_OUTPUT_LOG_RE.match, files))
+    std_logs = sorted(filter(_STD_LOG_RE.match, files))
     if len(output_logs) != len(std_logs):
         # Try to remove the files with no matching output/std logs
         op_fn = [f.split("_carbontracker")[0] for f in output_logs]
@@ -354,13 +359,11 @@ def get_devices(std_log_data: str) -> Dict[str, List[str]]:
 
             Where `[component]` is the component name and `"device1"`, `"device2"` are device names.
     """
-    comp_re = re.compile(r"The following components were found:(.*)\n")
-    device_re = re.compile(r" (.*?) with device\(s\) (.*?)\.")
     # Take first match as we only expect one.
-    match = re.findall(comp_re, std_log_data)
+    match = _COMPONENTS_RE.search(std_log_data)
     if not match:
         return {}
-    device_matches = re.findall(device_re, match[0])
+    device_matches = _DEVICE_RE.findall(match.group(1))
     devices = {}
 
     for comp, device_str in device_matches:
@@ -380,8 +383,7 @@ def get_epoch_durations(std_log_data):
     Returns:
         (list[float]): List of epoch durations (s)
     """
-    duration_re = re.compile(r"Duration: (\d+):(\d{2}):(\d\d?(?:.\d{2})?)")
-    matches = re.findall(duration_re, std_log_data)
+    matches = _DURATION_RE.findall(std_log_data)
     epoch_durations = [
         float(h) * 60 * 60 + float(m) * 60 + float(s) for h, m, s in matches
     ]
@@ -401,23 +403,16 @@ def get_avg_power_usages(std_log_data):
                         [component name]: list[list[float]]
                 }
     """
-    power_re = re.compile(r"Average power usage \(W\) for (.+): (\[?[0-9\.]+\]?|None)")
-    matches = re.findall(power_re, std_log_data)
-    components = list(set([comp for comp, _ in matches]))
-    avg_power_usages = {}
-
-    for component in components:
-        powers: list[list[float]] = []
-        for comp, power in matches:
-            if comp == component:
-                if power == "None":
-                    powers.append([0.0])
-                    continue
-                else:
-                    p_list = power.strip("[").strip("]").split(" ")
-                    p_power = [float(num) for num in p_list if num != ""]
-                    powers.append(p_power)
-        avg_power_usages[component] = powers
+    avg_power_usages: Dict[str, List[List[float]]] = {}
+
+    # Group the matches by component in a single pass.
+    for comp, power in _POWER_RE.findall(std_log_data):
+        powers = avg_power_usages.setdefault(comp, [])
+        if power == "None":
+            powers.append([0.0])
+        else:
+            p_list = power.strip("[").strip("]").split(" ")
+            powers.append([float(num) for num in p_list if num != ""])
 
     return avg_power_usages
 
@@ -440,10 +435,8 @@ def get_most_recent_logs(log_dir):
         if os.path.isfile(os.path.join(log_dir, f))
     ]
     # Find output and standard logs and sort by modified date.
-    output_re = re.compile(r".*carbontracker_output.log")
-    std_re = re.compile(r".*carbontracker.log")
-    output_logs = list(filter(output_re.match, files))
-    std_logs = list(filter(std_re.match, files))
+    output_logs = list(filter(_OUTPUT_LOG_RE.match, files))
+    std_logs = list(filter(_STD_LOG_RE.match, files))
     output_logs.sort(key=os.path.getmtime)
     std_logs.sort(key=os.path.getmtime)
 
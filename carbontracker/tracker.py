@@ -1,10 +1,13 @@
+import atexit
+import copy
 import os
 import sys
 import time
 import traceback
 import psutil
 import math
-from threading import Thread, Event
+from concurrent.futures import Future
+from threading import Thread, Event, current_thread
 from typing import List, Union
 
 import numpy as np
@@ -21,17 +24,30 @@ from carbontracker.emissions.conversion import co2eq
 from carbontracker.emissions.intensity.fetchers import electricitymaps
 
 
+# Resolution (s) of carbon intensity forecasts. A prefetched forecast is reused
+# if its duration differs by less than this from the requested duration.
+FORECAST_RESOLUTION = 1800
+
+
 class CarbonIntensityThread(Thread):
     """Sleeper thread to update Carbon Intensity every 15 minutes."""
 
-    def __init__(self, logger, stop_event, update_interval: Union[float, int] = 900):
+    def __init__(
+        self,
+        logger,
+        stop_event,
+        update_interval: Union[float, int] = 900,
+        offline=False,
+    ):
         super(CarbonIntensityThread, self).__init__()
         self.name = "CarbonIntensityThread"
         self.logger = logger
         self.update_interval: Union[float, int] = update_interval
+        self.offline = offline
         self.daemon = True
         self.stop_event = stop_event
         self.carbon_intensities = []
+        self._prefetched_prediction = None
 
         self.start()
 
@@ -45,27 +61,72 @@ class CarbonIntensityThread(Thread):
             self.logger.err_warn(err_str)
 
     def _fetch_carbon_intensity(self):
-        ci = intensity.carbon_intensity(self.logger)
-        if (
+        ci = intensity.carbon_intensity(self.logger, offline=self.offline)
+        if self._is_valid(ci):
+            self.carbon_intensities.append(ci)
+
+    @staticmethod
+    def _is_valid(ci):
+        return (
             ci.success
             and isinstance(ci.carbon_intensity, (int, float))
-            and not np.isnan(ci.carbon_intensity)
-        ):
-            self.carbon_intensities.append(ci)
+            and not math.isnan(ci.carbon_intensity)
+        )
+
+    def prefetch_prediction(self, pred_time_dur):
+        """Starts fetching the predicted carbon intensity in the background
+        s.t. predict_carbon_intensity does not block on the network."""
+        future = Future()
+
+        def fetch():
+            try:
+                future.set_result(
+                    intensity.carbon_intensity(
+                        self.logger, time_dur=pred_time_dur, offline=self.offline
+                    )
+                )
+            except Exception as e:
+                future.set_exception(e)
+
+        Thread(target=fetch, name="CarbonIntensityPrefetch", daemon=True).start()
+        self._prefetched_prediction = (pred_time_dur, future)
 
     def predict_carbon_intensity(self, pred_time_dur):
-        ci = intensity.carbon_intensity(self.logger, time_dur=pred_time_dur)
-        weighted_intensities = [
-            ci.carbon_intensity for ci in self.carbon_intensities
-        ] + [ci.carbon_intensity]
+        ci = None
+        if self._prefetched_prediction is not None:
+            time_dur, future = self._prefetched_prediction
+            self._prefetched_prediction = None
+            try:
+                prefetched = future.result()
+                # Current intensities do not depend on the duration and
+                # forecasts are only given per FORECAST_RESOLUTION seconds.
+                if (
+                    not prefetched.is_prediction
+                    or abs(time_dur - pred_time_dur) < FORECAST_RESOLUTION
+                ):
+                    ci = prefetched
+            except Exception:
+                err_str = traceback.format_exc()
+                self.logger.err_info(err_str)
+        if ci is None:
+            ci = intensity.carbon_intensity(
+                self.logger, time_dur=pred_time_dur, offline=self.offline
+            )
+        measured_intensities = [ci.carbon_intensity for ci in self.carbon_intensities]
 
-        # Account for measured intensities by taking weighted average.
-        weight = math.floor(pred_time_dur / self.update_interval)
+        # Fetchers without forecasts return the current intensity. It is
+        # stored as a measurement s.t. average_carbon_intensity does not fetch
+        # it again. A copy is stored as ci is modified below.
+        if not ci.is_prediction and self._is_valid(ci):
+            self.carbon_intensities.append(copy.copy(ci))
 
-        for _ in range(weight):
-            weighted_intensities.append(ci.carbon_intensity)
+        # Account for measured intensities by taking weighted average where
+        # the predicted intensity counts once per update interval.
+        weight = math.floor(pred_time_dur / self.update_interval) + 1
 
-        ci.carbon_intensity = np.mean(weighted_intensities)
+        ci.carbon_intensity = (
+            sum(measured_intensities) + weight * ci.carbon_intensity
+        ) / (len(measured_intensities) + weight)
         intensity.set_carbon_intensity_message(ci, pred_time_dur)
 
         self.logger.info(ci.message)
@@ -75,7 +136,7 @@ class CarbonIntensityThread(Thread):
 
     def average_carbon_intensity(self):
         if not self.carbon_intensities:
-            ci = intensity.carbon_intensity(self.logger)
+            ci = intensity.carbon_intensity(self.logger, offline=self.offline)
             self.carbon_intensities.append(ci)
 
         # Ensure that we have some carbon intensities.
@@ -125,8 +186,10 @@ class CarbonTrackerThread(Thread):
         self.epoch_times = []
         self.running = True
         self.measuring_event = Event()
+        self.stop_event = Event()
         self.epoch_counter = 0
         self.daemon = True
+        atexit.register(self._stop_at_exit)
 
         self.start()
 
@@ -134,11 +197,27 @@ class CarbonTrackerThread(Thread):
         """Thread's activity."""
         try:
             self.begin()
+            next_measurement = time.monotonic()
             while self.running:
-                # Wait for the measuring_event to be set
-                self.measuring_event.wait()
+                if not self.measuring_event.is_set():
+                    # Wait for the measuring_event to be set and restart the
+                    # sampling schedule from there.
+                    self.measuring_event.wait()
+                    next_measurement = time.monotonic()
+                if not self.running:
+                    break
                 self._collect_measurements()
-                time.sleep(self.update_interval)
+                # Sample on a fixed cadence s.t. the time spent collecting
+                # measurements does not stretch the update interval.
+                next_measurement += self.update_interval
+                remaining = next_measurement - time.monotonic()
+                if remaining < 0:
+                    # Collection overran the interval; skip ahead instead of
+                    # bursting to catch up.
+                    next_measurement = time.monotonic()
+                    remaining = 0
+                # Sleep on stop_event s.t. stop() wakes the thread immediately.
+                self.stop_event.wait(remaining)
 
             # Shutdown in thread's activity instead of epoch_end() to ensure
             # that we only shutdown after last measurement.
@@ -157,9 +236,21 @@ class CarbonTrackerThread(Thread):
             return
 
         self.running = False
+        self.stop_event.set()
+        # Wake the thread if it is waiting for an epoch to start.
+        self.measuring_event.set()
+        atexit.unregister(self._stop_at_exit)
         self.logger.info("Monitoring thread ended.")
         self.logger.output("Finished monitoring.", verbose_level=1)
 
+    def _stop_at_exit(self):
+        """Stops the thread at interpreter exit such that components are shut
+        down even if training crashed before the tracker was stopped."""
+        self.running = False
+        self.stop_event.set()
+        self.measuring_event.set()
+        self.join(timeout=self.update_interval)
+
     def epoch_start(self):
         self.epoch_counter += 1
         self.cur_epoch_time = time.time()
@@ -269,10 +360,12 @@ class CarbonTracker:
         ignore_errors (bool, optional): If set to `True` then all errors will cause energy monitoring to be stopped and training will continue. Otherwise, training will be interrupted as with regular errors.
         components (str, optional): Comma-separated string of which components to monitor. Options are: `"all"`, `"gpu"`, `"cpu"`, or `"gpu,cpu"`.
         devices_by_pid (bool, optional): If `True`, only devices (under the chosen components) running processes associated with the main process are measured. If False, all available devices are measured. Note that this requires your devices to have active processes before instantiating the CarbonTracker class.
+        include_graphics (bool, optional): If `True`, GPU processes with a graphics context are also considered when matching devices by PID. Otherwise, only compute processes are considered. Only used if `devices_by_pid` is `True`.
         log_dir (str, optional): Path to the desired directory to write log files. If `None`, then no logging will be done.
         log_file_prefix (str, optional): Prefix to add to the log file name.
         verbose (int, optional): Sets the level of verbosity.
         decimal_precision (int, optional): Desired decimal precision of reported values.
+        offline (bool or str, optional): If set, then no network requests are made to detect the location or to query carbon intensity APIs. Instead, the average carbon intensity of the given country (alpha-2 code, e.g. `"DK"`) from the bundled carbon intensity table is used. If set to `True`, the world average is used.
 
     Example:
         Tracking the carbon intensity of PyTorch model training:
@@ -308,6 +401,8 @@ class CarbonTracker:
         verbose=1,
         decimal_precision=12,
         api_keys=None,
+        offline=False,
+        include_graphics=False,
     ):
         if api_keys is not None:
             self.set_api_keys(api_keys)
@@ -340,7 +435,10 @@ class CarbonTracker:
             self.tracker = CarbonTrackerThread(
                 delete=self._delete,
                 components=component.create_components(
-                    components=components, pids=pids, devices_by_pid=devices_by_pid
+                    components=components,
+                    pids=pids,
+                    devices_by_pid=devices_by_pid,
+                    include_graphics=include_graphics,
                 ),
                 logger=self.logger,
                 ignore_errors=ignore_errors,
@@ -348,7 +446,7 @@ class CarbonTracker:
             )
             self.intensity_stopper = Event()
             self.intensity_updater = CarbonIntensityThread(
-                self.logger, self.intensity_stopper
+                self.logger, self.intensity_stopper, offline=offline
             )
         except Exception as e:
             self._handle_error(e)
@@ -363,6 +461,16 @@ class CarbonTracker:
         try:
             self.tracker.epoch_start()
             self.epoch_counter += 1
+
+            if self._is_pred_epoch() and len(self.tracker.epoch_times) > 0:
+                # Fetch the predicted carbon intensity while the epoch runs
+                # using the prediction from the epochs measured so far. It is
+                # reused if the final prediction is within the forecast
+                # resolution, which is the case for stable epoch times.
+                pred_time = predictor.predict_time(
+                    self.epochs, self.tracker.epoch_times
+                )
+                self.intensity_updater.prefetch_prediction(pred_time)
         except Exception as e:
             self._handle_error(e)
 
@@ -376,7 +484,7 @@ class CarbonTracker:
         try:
             self.tracker.epoch_end()
 
-            if self.epoch_counter == self.epochs_before_pred:
+            if self._is_pred_epoch():
                 self._output_pred()
                 if self.stop_and_confirm:
                     self._user_query()
@@ -389,6 +497,15 @@ class CarbonTracker:
         except Exception as e:
             self._handle_error(e)
 
+    def _is_pred_epoch(self):
+        """Whether the prediction is output after the current epoch. It is
+        skipped when all epochs have run and the actual consumption is output
+        after the same epoch, since it would only repeat it."""
+        return self.epoch_counter == self.epochs_before_pred and not (
+            self.epoch_counter >= self.epochs
+            and self.epoch_counter == self.monitor_epochs
+        )
+
     def stop(self):
         """Ensure that tracker is stopped and deleted. E.g. use with early
         stopping, where not all monitor_epochs have been run."""
@@ -455,7 +572,7 @@ class CarbonTracker:
         energy_usages = self.tracker.total_energy_per_epoch()
         energy = energy_usages.sum()
         times = self.tracker.epoch_times
-        time = np.sum(times)
+        time = sum(times)
         _co2eq = self._co2eq(energy)
         conversions = co2eq.convert(_co2eq) if self.interpretable else None
         if self.epochs_before_pred == 0:
@@ -503,20 +620,23 @@ class CarbonTracker:
         self._check_input(user_input)
 
     def _check_input(self, user_input: str):
+        while user_input not in ("y", "n"):
+            self.logger.output("Input not recognized. Try again (y/n):")
+            user_input = input().lower()
+
         if user_input == "y":
             self.logger.output("Continuing...")
-            return
-        elif user_input == "n":
+        else:
             self.logger.info("Session ended by user.")
             self.logger.output("Quitting...")
             sys.exit(0)
-        else:
-            self.logger.output("Input not recognized. Try again (y/n):")
-            user_input = input().lower()
-            self._check_input(user_input)
 
     def _delete(self):
         self.tracker.stop()
+        # Wait for components to be shut down instead of relying on garbage
+        # collection. The thread cannot join itself when deleting on errors.
+        if self.tracker is not current_thread():
+            self.tracker.join(timeout=self.tracker.update_interval + 1)
         self.intensity_stopper.set()
         del self.logger
         del self.tracker
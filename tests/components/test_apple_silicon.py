@@ -1,9 +1,11 @@
+import subprocess
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from carbontracker.components.apple_silicon.powermetrics import (
     AppleSiliconCPU,
     AppleSiliconGPU,
     PowerMetricsUnified,
+    _POWER_PATTERN,
 )
 
 
@@ -74,28 +76,64 @@ class TestAppleSiliconGPU(unittest.TestCase):
 
 
 class TestPowerMetricsUnified(unittest.TestCase):
-    @patch("subprocess.check_output", return_value="Sample Output")
-    @patch("time.time", side_effect=[100, 101, 102, 200, 202])
-    def test_get_output_with_actual_call(self, mock_time, mock_check_output):
-        # First call - should call subprocess
-        output1 = PowerMetricsUnified.get_output()
+    def setUp(self):
+        PowerMetricsUnified._process = None
+
+    def tearDown(self):
+        PowerMetricsUnified._process = None
 
-        # Second call - should use cached output
+    @patch("subprocess.Popen")
+    def test_get_output_streams_latest_sample(self, mock_popen):
+        mock_popen.return_value.poll.return_value = None
+        mock_popen.return_value.stdout = [
+            "*** Sampled system activity 1\n",
+            "CPU Power: 1000 mW\n",
+            "*** Sampled system activity 2\n",
+            "CPU Power: 2000 mW\n",
+        ]
+
+        output1 = PowerMetricsUnified.get_output()
+        PowerMetricsUnified._reader.join(timeout=1)
         output2 = PowerMetricsUnified.get_output()
-        self.assertIsNotNone(PowerMetricsUnified._last_updated)
-        if PowerMetricsUnified._last_updated is None:
-            self.fail()
-        # Advance time to invalidate cache
-        PowerMetricsUnified._last_updated -= 2
 
-        # Third call - should call subprocess again
-        output3 = PowerMetricsUnified.get_output()
+        mock_popen.assert_called_once()
+        self.assertIn("CPU Power: 2000 mW", output2)
+        self.assertIn("*** Sampled system activity", output1)
+
+    @patch("subprocess.Popen")
+    def test_get_output_process_failure(self, mock_popen):
+        mock_popen.return_value.poll.return_value = 1
+        mock_popen.return_value.stdout = []
 
-        self.assertEqual(mock_check_output.call_count, 2)
-        self.assertEqual(output1, "Sample Output")
-        self.assertEqual(output2, "Sample Output")
-        self.assertEqual(output3, "Sample Output")
+        with self.assertRaises(subprocess.CalledProcessError):
+            PowerMetricsUnified.get_output()
 
+    def test_stop_terminates_process(self):
+        process = MagicMock()
+        process.poll.return_value = None
+        PowerMetricsUnified._process = process
+
+        PowerMetricsUnified._stop()
+
+        process.terminate.assert_called_once()
+        self.assertIsNone(PowerMetricsUnified._process)
+
+    @patch(
+        "carbontracker.components.apple_silicon.powermetrics.PowerMetricsUnified.get_output",
+        return_value="CPU Power: 1500 mW\nGPU Power: 500 mW\nANE Power: 300 mW",
+    )
+    @patch("carbontracker.components.apple_silicon.powermetrics._POWER_PATTERN")
+    def test_get_powers_parses_output_once(self, mock_pattern, mock_get_output):
+        mock_pattern.finditer.side_effect = _POWER_PATTERN.finditer
+
+        cpu_handler = AppleSiliconCPU(pids=[], devices_by_pid=False)
+        cpu_handler.init()
+        gpu_handler = AppleSiliconGPU(pids=[], devices_by_pid=False)
+        gpu_handler.init()
+
+        self.assertEqual(cpu_handler.power_usage(), [1.5])
+        self.assertAlmostEqual(gpu_handler.power_usage()[0], 0.8, places=2)
+        mock_pattern.finditer.assert_called_once()
 
 class TestAppleSiliconGPUPowerUsage(unittest.TestCase):
     def setUp(self):
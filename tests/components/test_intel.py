@@ -15,6 +15,11 @@ class TestIntelCPU(unittest.TestCase):
         component = Component(name='cpu', pids=[], devices_by_pid={})
         self.assertTrue(component.available())
 
+    @patch("os.listdir", side_effect=FileNotFoundError)
+    def test_available_no_rapl_dir(self, mock_listdir):
+        cpu = IntelCPU(pids=[], devices_by_pid={})
+        self.assertFalse(cpu.available())
+
     @patch("os.path.exists")
     @patch("os.listdir")
     @patch("builtins.open", new_callable=mock_open, read_data="some_name")
@@ -61,6 +66,20 @@ class TestIntelCPU(unittest.TestCase):
         self.assertEqual(power_usages, [0.00, 0.00])
 
 
+    @patch("time.monotonic")
+    @patch("time.sleep")
+    @patch("carbontracker.components.cpu.intel.IntelCPU._get_measurements")
+    def test_power_usage_since_previous_call(self, mock_get_measurements, mock_sleep, mock_monotonic):
+        mock_get_measurements.side_effect = [[10, 20], [20, 30], [4000020, 2000030]]
+        mock_monotonic.side_effect = [100, 102, 102]
+
+        cpu = IntelCPU(pids=[], devices_by_pid={})
+        cpu.power_usage()
+        power_usages = cpu.power_usage()
+
+        mock_sleep.assert_called_once()
+        self.assertEqual(power_usages, [2.0, 1.0])
+
     @patch("builtins.open", new_callable=mock_open, read_data="1000000")
     def test__read_energy(self, mock_file):
         cpu = IntelCPU(pids=[], devices_by_pid={})
@@ -131,11 +150,43 @@ class TestIntelCPU(unittest.TestCase):
         self.assertEqual(measurements, [2000000, 1000000])
 
 
-    def test_shutdown(self):
+    @patch("os.path.join")
+    @patch("os.listdir")
+    @patch("carbontracker.components.cpu.intel.IntelCPU._read_energy")
+    def test__get_measurements_file_not_found_lists_parts_once(self, mock_read_energy, mock_listdir, mock_path_join):
+        mock_path_join.return_value = "/some/path"
+        mock_read_energy.side_effect = [FileNotFoundError(), 1000000, 1000000, 2000000, 2000000]
+        mock_listdir.return_value = ["intel-rapl:0:0", "intel-rapl:0:1"]
+
         cpu = IntelCPU(pids=[], devices_by_pid={})
-        # As the shutdown method is currently a pass, there's nothing to assert here.
-        # But we still call it for the sake of completeness and future modifications.
+        cpu._rapl_devices = ["intel-rapl:0"]
+        cpu.parts_pattern = re.compile(r"intel-rapl:(\d):(\d)")
+        cpu._get_measurements()
+        measurements = cpu._get_measurements()
+
+        self.assertEqual(measurements, [4000000])
+        mock_listdir.assert_called_once()
+
+    @patch("builtins.open", new_callable=mock_open, read_data="1000000")
+    def test__read_energy_reuses_file(self, mock_file):
+        cpu = IntelCPU(pids=[], devices_by_pid={})
+        mock_file.return_value.read.return_value = "1000000"
+        cpu._read_energy("/some/path")
+        mock_file.return_value.read.return_value = "2000000"
+        energy = cpu._read_energy("/some/path")
+
+        self.assertEqual(energy, 2000000)
+        mock_file.assert_called_once()
+        self.assertEqual(mock_file.return_value.seek.call_count, 2)
+
+    @patch("builtins.open", new_callable=mock_open, read_data="1000000")
+    def test_shutdown(self, mock_file):
+        cpu = IntelCPU(pids=[], devices_by_pid={})
+        cpu._read_energy("/some/path")
         cpu.shutdown()
 
+        mock_file.return_value.close.assert_called_once()
+        self.assertEqual(cpu._energy_files, {})
+
 if __name__ == "__main__":
     unittest.main()
@@ -7,6 +7,10 @@ from carbontracker.components.gpu.nvidia import NvidiaGPU
 
 
 class PynvmlStub:
+    NVMLError = pynvml.NVMLError
+    NVML_ERROR_NOT_SUPPORTED = pynvml.NVML_ERROR_NOT_SUPPORTED
+    NVML_TOTAL_POWER_SAMPLES = pynvml.NVML_TOTAL_POWER_SAMPLES
+
     @staticmethod
     def nvmlInit():
         pass
@@ -28,6 +32,10 @@ class PynvmlStub:
     def nvmlDeviceGetPowerUsage(handle):
         return 1000  # Returns power usage in mW
 
+    @staticmethod
+    def nvmlDeviceGetSamples(handle, sampling_type, timestamp):
+        raise pynvml.NVMLError(pynvml.NVML_ERROR_NOT_SUPPORTED)
+
     @staticmethod
     def nvmlDeviceGetName(handle):
         if sys.version_info < (3, 10):
@@ -55,6 +63,19 @@ class TestNvidiaGPU(unittest.TestCase):
         gpu._handles = [0]
         self.assertEqual(gpu.devices(), ["GPU"])
 
+    @patch("carbontracker.components.gpu.nvidia.pynvml")
+    def test_devices_names_are_cached(self, mock_pynvml):
+        mock_pynvml.nvmlDeviceGetName.return_value = (
+            b"GPU" if sys.version_info < (3, 10) else "GPU"
+        )
+        gpu = NvidiaGPU(pids=[], devices_by_pid=False)
+        gpu._handles = [0]
+        self.assertEqual(gpu.devices(), ["GPU"])
+        self.assertEqual(gpu.devices(), ["GPU"])
+        mock_pynvml.nvmlDeviceGetName.assert_called_once_with(0)
+        gpu.shutdown()
+        self.assertEqual(gpu.devices(), [])
+
     @patch("carbontracker.components.gpu.nvidia.pynvml", new=PynvmlStub)
     def test_available(self):
         gpu = NvidiaGPU(pids=[], devices_by_pid=False)
@@ -66,6 +87,40 @@ class TestNvidiaGPU(unittest.TestCase):
         gpu._handles = [0]
         self.assertEqual(gpu.power_usage(), [1])
 
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetPowerUsage")
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetSamples")
+    def test_power_usage_from_samples(self, mock_get_samples, mock_get_power_usage):
+        samples = [
+            pynvml.c_nvmlSample_t(1, pynvml.c_nvmlValue_t(uiVal=1000)),
+            pynvml.c_nvmlSample_t(2, pynvml.c_nvmlValue_t(uiVal=3000)),
+        ]
+        mock_get_samples.return_value = (pynvml.NVML_VALUE_TYPE_UNSIGNED_INT, samples)
+        gpu = NvidiaGPU(pids=[], devices_by_pid=False)
+        gpu._handles = [0]
+        self.assertEqual(gpu.power_usage(), [2])
+        mock_get_samples.return_value = (pynvml.NVML_VALUE_TYPE_UNSIGNED_INT, [])
+        mock_get_power_usage.return_value = 5000
+        self.assertEqual(gpu.power_usage(), [5])
+        self.assertEqual(
+            mock_get_samples.call_args[0],
+            (0, pynvml.NVML_TOTAL_POWER_SAMPLES, 2),
+        )
+
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetPowerUsage")
+    @patch(
+        "carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetSamples",
+        side_effect=pynvml.NVMLError(pynvml.NVML_ERROR_NOT_SUPPORTED),
+    )
+    def test_power_usage_samples_not_supported(
+        self, mock_get_samples, mock_get_power_usage
+    ):
+        mock_get_power_usage.return_value = 1000
+        gpu = NvidiaGPU(pids=[], devices_by_pid=False)
+        gpu._handles = [0]
+        self.assertEqual(gpu.power_usage(), [1])
+        self.assertEqual(gpu.power_usage(), [1])
+        mock_get_samples.assert_called_once()
+
     @patch("carbontracker.components.gpu.nvidia.pynvml", new=PynvmlStub)
     def test_init_shutdown(self):
         gpu = NvidiaGPU(pids=[], devices_by_pid=False)
@@ -74,6 +129,14 @@ class TestNvidiaGPU(unittest.TestCase):
         gpu.shutdown()
         self.assertEqual(gpu._handles, [])
 
+    @patch("carbontracker.components.gpu.nvidia.pynvml")
+    def test_init_is_idempotent(self, mock_pynvml):
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        gpu = NvidiaGPU(pids=[], devices_by_pid=False)
+        gpu.init()
+        gpu.init()
+        mock_pynvml.nvmlInit.assert_called_once()
+
     @patch("carbontracker.components.gpu.nvidia.pynvml", new=PynvmlStub)
     def test_init(self):
         gpu = NvidiaGPU(pids=[1234], devices_by_pid=True)
@@ -94,6 +157,34 @@ class TestNvidiaGPU(unittest.TestCase):
         gpu = NvidiaGPU(pids=[], devices_by_pid=False)
         self.assertEqual(gpu._slurm_gpu_indices(), [0])
 
+    @patch("carbontracker.components.gpu.nvidia.pynvml")
+    @patch.dict(
+        "carbontracker.components.gpu.nvidia.os.environ",
+        {"CUDA_VISIBLE_DEVICES": "GPU-abc, 2"},
+    )
+    def test_slurm_gpu_indices_uuid(self, mock_pynvml):
+        mock_pynvml.nvmlDeviceGetIndex.return_value = 3
+        gpu = NvidiaGPU(pids=[], devices_by_pid=False)
+        self.assertEqual(gpu._slurm_gpu_indices(), [3, 2])
+        mock_pynvml.nvmlDeviceGetHandleByUUID.assert_called_once_with("GPU-abc")
+
+    @patch.dict(
+        "carbontracker.components.gpu.nvidia.os.environ",
+        {"SLURM_JOB_GPUS": "1,3"},
+        clear=True,
+    )
+    def test_slurm_gpu_indices_slurm_job_gpus(self):
+        gpu = NvidiaGPU(pids=[], devices_by_pid=False)
+        self.assertEqual(gpu._slurm_gpu_indices(), [1, 3])
+
+    @patch.dict(
+        "carbontracker.components.gpu.nvidia.os.environ",
+        {"CUDA_VISIBLE_DEVICES": "not-a-gpu"},
+    )
+    def test_slurm_gpu_indices_invalid(self):
+        gpu = NvidiaGPU(pids=[], devices_by_pid=False)
+        self.assertIsNone(gpu._slurm_gpu_indices())
+
     @patch("carbontracker.components.gpu.nvidia.pynvml", new=PynvmlStub)
     def test_get_handles_by_pid(self):
         gpu = NvidiaGPU(pids=[1234], devices_by_pid=True)
@@ -101,6 +192,30 @@ class TestNvidiaGPU(unittest.TestCase):
         self.assertEqual(gpu._handles, [0])
         gpu.shutdown()
 
+    @patch("carbontracker.components.gpu.nvidia.pynvml")
+    def test_get_handles_by_pid_skips_graphics_on_compute_match(self, mock_pynvml):
+        mock_pynvml.nvmlDeviceGetCount.return_value = 2
+        mock_pynvml.nvmlDeviceGetHandleByIndex.side_effect = lambda index: index
+        compute = {0: [MagicMock(pid=1234)], 1: [MagicMock(pid=1)]}
+        graphics = {1: [MagicMock(pid=1234)]}
+        mock_pynvml.nvmlDeviceGetComputeRunningProcesses.side_effect = compute.get
+        mock_pynvml.nvmlDeviceGetGraphicsRunningProcesses.side_effect = graphics.get
+        gpu = NvidiaGPU(pids=[1234], devices_by_pid=True, include_graphics=True)
+        self.assertEqual(gpu._get_handles_by_pid(), [0, 1])
+        mock_pynvml.nvmlDeviceGetGraphicsRunningProcesses.assert_called_once_with(1)
+
+    @patch("carbontracker.components.gpu.nvidia.pynvml")
+    def test_get_handles_by_pid_compute_only_by_default(self, mock_pynvml):
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        mock_pynvml.nvmlDeviceGetHandleByIndex.side_effect = lambda index: index
+        mock_pynvml.nvmlDeviceGetComputeRunningProcesses.return_value = []
+        mock_pynvml.nvmlDeviceGetGraphicsRunningProcesses.return_value = [
+            MagicMock(pid=1234)
+        ]
+        gpu = NvidiaGPU(pids=[1234], devices_by_pid=True)
+        self.assertEqual(gpu._get_handles_by_pid(), [])
+        mock_pynvml.nvmlDeviceGetGraphicsRunningProcesses.assert_not_called()
+
     @patch("sys.version_info", new=(3, 8))
     @patch("carbontracker.components.gpu.nvidia.pynvml", new=PynvmlStub)
     def test_devices_python_version_less_than_3_10(self):
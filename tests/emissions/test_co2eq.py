@@ -13,5 +13,8 @@ class TestConversion(unittest.TestCase):
         self.assertAlmostEqual(expected[0][0], actual[0][0], places=5)
         self.assertEqual(expected[0][1], actual[0][1])
 
+    def test_convert_out_of_range(self):
+        self.assertEqual(convert(-1), [])
+
 if __name__ == '__main__':
     unittest.main()
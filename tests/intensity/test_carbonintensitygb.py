@@ -1,5 +1,7 @@
 from unittest import TestCase, mock
 import datetime
+import threading
+import time
 from carbontracker.emissions.intensity.fetchers import carbonintensitygb
 from carbontracker import exceptions
 
@@ -20,7 +22,7 @@ class TestCarbonIntensityGB(TestCase):
 
     @mock.patch("carbontracker.emissions.intensity.fetchers.carbonintensitygb.datetime")
     @mock.patch(
-        "carbontracker.emissions.intensity.fetchers.carbonintensitygb.requests.get"
+        "carbontracker.emissions.intensity.fetchers.carbonintensitygb._SESSION.get"
     )
     def test_carbon_intensity_gb_regional(self, mock_get, mock_datetime):
         mock_response = mock.MagicMock()
@@ -57,12 +59,13 @@ class TestCarbonIntensityGB(TestCase):
         to_str = "2023-05-20T01:00Z"
 
         mock_get.assert_called_once_with(
-            f"https://api.carbonintensity.org.uk/regional/intensity/{from_str}/{to_str}/postcode/AB12 3CD"
+            f"https://api.carbonintensity.org.uk/regional/intensity/{from_str}/{to_str}/postcode/AB12 3CD",
+            timeout=carbonintensitygb.TIMEOUT,
         )
         self.assertEqual(result, 250)
 
     @mock.patch(
-        "carbontracker.emissions.intensity.fetchers.carbonintensitygb.requests.get"
+        "carbontracker.emissions.intensity.fetchers.carbonintensitygb._SESSION.get"
     )
     def test_carbon_intensity_gb_regional_with_error_response(self, mock_get):
         mock_response = mock.MagicMock()
@@ -77,7 +80,7 @@ class TestCarbonIntensityGB(TestCase):
 
     @mock.patch("carbontracker.emissions.intensity.fetchers.carbonintensitygb.datetime")
     @mock.patch(
-        "carbontracker.emissions.intensity.fetchers.carbonintensitygb.requests.get"
+        "carbontracker.emissions.intensity.fetchers.carbonintensitygb._SESSION.get"
     )
     def test_carbon_intensity_gb_national(self, mock_get, mock_datetime):
         mock_response = mock.MagicMock()
@@ -105,12 +108,13 @@ class TestCarbonIntensityGB(TestCase):
         result = self.fetcher._carbon_intensity_gb_national(time_dur)
 
         mock_get.assert_called_once_with(
-            f"https://api.carbonintensity.org.uk/intensity/{from_str}/{to_str}"
+            f"https://api.carbonintensity.org.uk/intensity/{from_str}/{to_str}",
+            timeout=carbonintensitygb.TIMEOUT,
         )
         self.assertEqual(result, 250)
 
     @mock.patch(
-        "carbontracker.emissions.intensity.fetchers.carbonintensitygb.requests.get"
+        "carbontracker.emissions.intensity.fetchers.carbonintensitygb._SESSION.get"
     )
     def test_carbon_intensity_gb_national_with_error_response(self, mock_get):
         mock_response = mock.MagicMock()
@@ -134,7 +138,7 @@ class TestCarbonIntensityGB(TestCase):
         self.assertEqual(result, (from_str, to_str))
 
     @mock.patch(
-        "carbontracker.emissions.intensity.fetchers.carbonintensitygb.requests.get"
+        "carbontracker.emissions.intensity.fetchers.carbonintensitygb._SESSION.get"
     )
     def test_carbon_intensity_with_postal(self, mock_get):
         mock_response = mock.MagicMock()
@@ -151,7 +155,7 @@ class TestCarbonIntensityGB(TestCase):
         self.assertEqual(carbon_intensity_obj.is_prediction, True)
 
     @mock.patch(
-        "carbontracker.emissions.intensity.fetchers.carbonintensitygb.requests.get"
+        "carbontracker.emissions.intensity.fetchers.carbonintensitygb._SESSION.get"
     )
     def test_carbon_intensity_without_postal(self, mock_get):
         mock_response = mock.MagicMock()
@@ -167,7 +171,7 @@ class TestCarbonIntensityGB(TestCase):
         self.assertEqual(carbon_intensity_obj.is_prediction, True)
 
     @mock.patch(
-        "carbontracker.emissions.intensity.fetchers.carbonintensitygb.requests.get"
+        "carbontracker.emissions.intensity.fetchers.carbonintensitygb._SESSION.get"
     )
     def test_carbon_intensity_gb_regional_without_time_dur(self, mock_get):
         mock_response = mock.MagicMock()
@@ -179,3 +183,77 @@ class TestCarbonIntensityGB(TestCase):
 
         carbon_intensity_obj = self.fetcher.carbon_intensity(g_location, None)
         self.assertEqual(carbon_intensity_obj.carbon_intensity, 250)
+
+    @mock.patch.object(
+        carbonintensitygb.CarbonIntensityGB,
+        "_carbon_intensity_gb_national",
+        return_value=300,
+    )
+    @mock.patch.object(
+        carbonintensitygb.CarbonIntensityGB,
+        "_carbon_intensity_gb_regional",
+        return_value=200,
+    )
+    def test_carbon_intensity_prefers_regional(self, mock_regional, mock_national):
+        g_location = mock.MagicMock(postal="AB12 3CD", country="GB")
+
+        carbon_intensity_obj = self.fetcher.carbon_intensity(g_location)
+
+        self.assertEqual(carbon_intensity_obj.carbon_intensity, 200)
+        mock_regional.assert_called_once_with("AB12 3CD", time_dur=None)
+        mock_national.assert_not_called()
+
+    @mock.patch.object(
+        carbonintensitygb.CarbonIntensityGB,
+        "_carbon_intensity_gb_national",
+        return_value=300,
+    )
+    @mock.patch.object(
+        carbonintensitygb.CarbonIntensityGB,
+        "_carbon_intensity_gb_regional",
+        side_effect=exceptions.CarbonIntensityFetcherError("error"),
+    )
+    def test_carbon_intensity_falls_back_to_national(
+        self, mock_regional, mock_national
+    ):
+        g_location = mock.MagicMock(postal="AB12 3CD", country="GB")
+
+        carbon_intensity_obj = self.fetcher.carbon_intensity(g_location)
+
+        self.assertEqual(carbon_intensity_obj.carbon_intensity, 300)
+
+    @mock.patch.object(carbonintensitygb, "NATIONAL_FALLBACK_DELAY", 0.01)
+    @mock.patch.object(
+        carbonintensitygb.CarbonIntensityGB, "_carbon_intensity_gb_national"
+    )
+    @mock.patch.object(
+        carbonintensitygb.CarbonIntensityGB, "_carbon_intensity_gb_regional"
+    )
+    def test_carbon_intensity_regional_does_not_wait_for_national(
+        self, mock_regional, mock_national
+    ):
+        regional_release = threading.Event()
+        national_release = threading.Event()
+
+        def regional(postcode, time_dur=None):
+            regional_release.wait(timeout=5)
+            return 200
+
+        def national(time_dur=None):
+            # Let the slow regional query finish while national is blocked.
+            regional_release.set()
+            national_release.wait(timeout=5)
+            return 300
+
+        mock_regional.side_effect = regional
+        mock_national.side_effect = national
+        g_location = mock.MagicMock(postal="AB12 3CD", country="GB")
+
+        start = time.monotonic()
+        carbon_intensity_obj = self.fetcher.carbon_intensity(g_location)
+        elapsed = time.monotonic() - start
+        national_release.set()
+
+        self.assertEqual(carbon_intensity_obj.carbon_intensity, 200)
+        mock_national.assert_called_once_with(time_dur=None)
+        self.assertLess(elapsed, 5)
@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import patch, MagicMock
+from carbontracker.emissions.intensity.fetchers import electricitymaps
 from carbontracker.emissions.intensity.fetchers.electricitymaps import ElectricityMap
 from carbontracker import exceptions
 
@@ -20,7 +21,9 @@ class TestElectricityMap(unittest.TestCase):
         ElectricityMap.set_api_key("test_key")
         self.assertTrue(self.electricity_map.suitable(self.g_location))
 
-    @patch("requests.get")
+    @patch(
+        "carbontracker.emissions.intensity.fetchers.electricitymaps._SESSION.get"
+    )
     def test_carbon_intensity_by_location_with_lon_lat(self, mock_get):
         mock_response = MagicMock()
         mock_response.ok = True
@@ -30,7 +33,9 @@ class TestElectricityMap(unittest.TestCase):
         result = self.electricity_map._carbon_intensity_by_location(lon=self.g_location.lng, lat=self.g_location.lat)
         self.assertEqual(result, 50.0)
 
-    @patch("requests.get")
+    @patch(
+        "carbontracker.emissions.intensity.fetchers.electricitymaps._SESSION.get"
+    )
     def test_carbon_intensity_by_location_with_zone(self, mock_get):
         mock_response = MagicMock()
         mock_response.ok = True
@@ -40,7 +45,26 @@ class TestElectricityMap(unittest.TestCase):
         result = self.electricity_map._carbon_intensity_by_location(zone=self.g_location.country)
         self.assertEqual(result, 75.0)
 
-    @patch("requests.get")
+    @patch(
+        "carbontracker.emissions.intensity.fetchers.electricitymaps._SESSION.get"
+    )
+    def test_carbon_intensity_by_location_sends_api_key(self, mock_get):
+        ElectricityMap.set_api_key("test_key")
+        mock_get.return_value.ok = True
+        mock_get.return_value.json.return_value = {"carbonIntensity": 75.0}
+
+        self.electricity_map._carbon_intensity_by_location(zone="DK")
+
+        mock_get.assert_called_once_with(
+            "https://api-access.electricitymaps.com/free-tier/carbon-intensity/latest",
+            headers={"auth-token": "test_key"},
+            params={"zone": "DK"},
+            timeout=electricitymaps.TIMEOUT,
+        )
+
+    @patch(
+        "carbontracker.emissions.intensity.fetchers.electricitymaps._SESSION.get"
+    )
     def test_carbon_intensity_by_location_response_not_ok(self, mock_get):
         mock_response = MagicMock()
         mock_response.ok = False
@@ -16,7 +16,9 @@ class TestEnergiDataService(unittest.TestCase):
         self.geocoder.country = "US"
         self.assertFalse(self.fetcher.suitable(self.geocoder))
 
-    @mock.patch("requests.get")
+    @mock.patch(
+        "carbontracker.emissions.intensity.fetchers.energidataservice._SESSION.get"
+    )
     def test_carbon_intensity_no_time_dur(self, mock_get):
         mock_response = mock.MagicMock()
         mock_response.ok = True
@@ -29,7 +31,26 @@ class TestEnergiDataService(unittest.TestCase):
         self.assertEqual(result.carbon_intensity, 1.0)
         self.assertFalse(result.is_prediction)
 
-    @mock.patch("requests.get")
+    @mock.patch(
+        "carbontracker.emissions.intensity.fetchers.energidataservice._SESSION.get"
+    )
+    def test_emission_current_averages_areas(self, mock_get):
+        def get(url, timeout):
+            mock_response = mock.MagicMock()
+            mock_response.ok = True
+            emission = 100.0 if "DK1" in url else 200.0
+            mock_response.json.return_value = {"records": [{"CO2Emission": emission}]}
+            return mock_response
+
+        mock_get.side_effect = get
+        result = self.fetcher._emission_current()
+
+        self.assertEqual(result, 150.0)
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch(
+        "carbontracker.emissions.intensity.fetchers.energidataservice._SESSION.get"
+    )
     def test_carbon_intensity_with_time_dur(self, mock_get):
         mock_response = mock.MagicMock()
         mock_response.ok = True
@@ -48,7 +69,9 @@ class TestEnergiDataService(unittest.TestCase):
         self.assertEqual(result.carbon_intensity, 2.5)
         self.assertTrue(result.is_prediction)
 
-    @mock.patch("requests.get")
+    @mock.patch(
+        "carbontracker.emissions.intensity.fetchers.energidataservice._SESSION.get"
+    )
     def test_nearest_5_min(self, mock_get):
         mock_response = mock.MagicMock()
         mock_response.ok = True
@@ -78,9 +101,13 @@ class TestEnergiDataService(unittest.TestCase):
 
         # Check that the mocked requests.get was called with the expected URL
         expected_url = f"https://api.energidataservice.dk/dataset/CO2Emis?start={expected_from_time}&end={expected_to_time}&limit=4"
-        mock_get.assert_called_once_with(expected_url)
+        mock_get.assert_called_once_with(
+            expected_url, timeout=energidataservice.TIMEOUT
+        )
 
-    @mock.patch("requests.get")
+    @mock.patch(
+        "carbontracker.emissions.intensity.fetchers.energidataservice._SESSION.get"
+    )
     def test_emission_current_response_not_ok(self, mock_get):
         mock_response = mock.MagicMock()
         mock_response.ok = False
@@ -90,7 +117,9 @@ class TestEnergiDataService(unittest.TestCase):
         with self.assertRaises(exceptions.CarbonIntensityFetcherError):
             self.fetcher._emission_current()
 
-    @mock.patch("requests.get")
+    @mock.patch(
+        "carbontracker.emissions.intensity.fetchers.energidataservice._SESSION.get"
+    )
     def test_emission_prognosis_response_not_ok(self, mock_get):
         mock_response = mock.MagicMock()
         mock_response.ok = False
@@ -99,3 +128,15 @@ class TestEnergiDataService(unittest.TestCase):
 
         with self.assertRaises(exceptions.CarbonIntensityFetcherError):
             self.fetcher._emission_prognosis(time_dur=1800)
+
+    @mock.patch(
+        "carbontracker.emissions.intensity.fetchers.energidataservice._SESSION.get"
+    )
+    def test_emission_prognosis_no_records(self, mock_get):
+        mock_response = mock.MagicMock()
+        mock_response.ok = True
+        mock_response.json.return_value = {"records": []}
+        mock_get.return_value = mock_response
+
+        with self.assertRaises(exceptions.CarbonIntensityFetcherError):
+            self.fetcher._emission_prognosis(time_dur=1800)
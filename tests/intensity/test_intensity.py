@@ -5,13 +5,16 @@ import numpy as np
 import pandas as pd
 import sys
 
-from carbontracker import constants
+from carbontracker import constants, exceptions
 from carbontracker.emissions.intensity import intensity
 
 from carbontracker.emissions.intensity.intensity import carbon_intensity
 
 
 class TestIntensity(unittest.TestCase):
+    def setUp(self):
+        intensity._cached_location = None
+
     @patch("geocoder.ip")
     def test_get_default_intensity_success(self, mock_geocoder_ip):
         mock_location = MagicMock()
@@ -168,6 +171,61 @@ class TestIntensity(unittest.TestCase):
                 expected_message = set_expected_message(is_prediction, success, carbon_intensity)
                 self.assertEqual(ci.message, expected_message)
 
+    @patch("geocoder.ip")
+    @patch("carbontracker.emissions.intensity.fetchers.electricitymaps.ElectricityMap.carbon_intensity")
+    def test_carbon_intensity_offline(self, mock_electricity_map_carbon_intensity, mock_geocoder_ip):
+        logger = MagicMock()
+
+        result = carbon_intensity(logger, offline=True)
+
+        mock_geocoder_ip.assert_not_called()
+        mock_electricity_map_carbon_intensity.assert_not_called()
+        logger.err_warn.assert_not_called()
+        self.assertEqual(result.carbon_intensity, constants.WORLD_2019_CARBON_INTENSITY)
+        self.assertEqual(result.address, "UNDETECTED")
+        self.assertFalse(result.success)
+        self.assertIn("Offline mode", result.message)
+        self.assertNotIn("Live carbon intensity could not be fetched", result.message)
+
+    @patch("geocoder.ip")
+    def test_carbon_intensity_offline_country(self, mock_geocoder_ip):
+        result = carbon_intensity(MagicMock(), offline="dk")
+        expected_intensity, _ = intensity._average_intensity("DK")
+
+        mock_geocoder_ip.assert_not_called()
+        self.assertNotEqual(expected_intensity, constants.WORLD_2019_CARBON_INTENSITY)
+        self.assertEqual(result.carbon_intensity, expected_intensity)
+        self.assertIn("Offline mode", result.message)
+        self.assertIn("for DK in", result.message)
+
+    def test_get_offline_intensity_unknown_country(self):
+        result = intensity.get_offline_intensity("XX")
+
+        self.assertEqual(result["carbon_intensity"], constants.WORLD_2019_CARBON_INTENSITY)
+        self.assertIn("for world in 2019", result["description"])
+
+    @patch("geocoder.ip")
+    def test_set_carbon_intensity_message_offline(self, mock_geocoder_ip):
+        ci = carbon_intensity(MagicMock(), offline=True)
+        intensity.set_carbon_intensity_message(ci, 3600)
+
+        mock_geocoder_ip.assert_not_called()
+        self.assertTrue(ci.message.startswith("Offline mode"))
+        self.assertNotIn("detected location", ci.message)
+
+    @patch("geocoder.ip")
+    def test_default_intensity_looked_up_on_first_use(self, mock_geocoder_ip):
+        mock_geocoder_ip.return_value.ok = False
+
+        with patch.object(intensity, "default_intensity", None):
+            ci = intensity.CarbonIntensity()
+            mock_geocoder_ip.assert_not_called()
+            ci.set_as_default()
+            ci.set_as_default()
+
+        mock_geocoder_ip.assert_called_once_with("me")
+        self.assertEqual(ci.carbon_intensity, constants.WORLD_2019_CARBON_INTENSITY)
+
     @patch("geocoder.ip")
     @patch("carbontracker.emissions.intensity.fetchers.electricitymaps.ElectricityMap.suitable")
     def test_carbon_intensity_address_assignment(self, mock_electricity_map_suitable, mock_geocoder_ip):
@@ -258,3 +316,42 @@ class TestIntensity(unittest.TestCase):
         self.assertFalse(result.success)
         self.assertTrue(np.isnan(result.carbon_intensity))
         self.assertEqual(mock_location.address, "Sample Address")
+
+    @patch("carbontracker.emissions.intensity.intensity.time.monotonic")
+    @patch("carbontracker.emissions.intensity.intensity.geocoder.ip")
+    def test_ip_location_is_reused(self, mock_geocoder_ip, mock_monotonic):
+        mock_location = MagicMock(ok=True)
+        mock_geocoder_ip.return_value = mock_location
+        mock_monotonic.return_value = 0
+
+        self.assertIs(intensity._ip_location(), mock_location)
+        mock_monotonic.return_value = intensity.LOCATION_TTL - 1
+        self.assertIs(intensity._ip_location(), mock_location)
+        mock_geocoder_ip.assert_called_once()
+
+        mock_monotonic.return_value = intensity.LOCATION_TTL
+        intensity._ip_location()
+        self.assertEqual(mock_geocoder_ip.call_count, 2)
+
+    @patch("carbontracker.emissions.intensity.intensity.geocoder.ip")
+    def test_ip_location_failure_is_not_cached(self, mock_geocoder_ip):
+        mock_geocoder_ip.return_value.ok = False
+
+        with self.assertRaises(exceptions.IPLocationError):
+            intensity._ip_location()
+        self.assertIsNone(intensity._cached_location)
+
+    @patch("carbontracker.emissions.intensity.intensity.geocoder.ip")
+    def test_carbon_intensity_given_location(self, mock_geocoder_ip):
+        g_location = MagicMock(address="Sample Address")
+        fetcher = MagicMock()
+        fetcher.carbon_intensity.return_value = intensity.CarbonIntensity(
+            carbon_intensity=23.0
+        )
+
+        result = carbon_intensity(MagicMock(), fetchers=[fetcher], g_location=g_location)
+
+        mock_geocoder_ip.assert_not_called()
+        fetcher.suitable.assert_called_once_with(g_location)
+        self.assertEqual(result.address, "Sample Address")
+        self.assertTrue(result.success)
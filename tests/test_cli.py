@@ -19,26 +19,26 @@ def mock_password_input(prompt):
 @skipIf(os.environ.get('CI') == 'true', 'Skipped due to CI')
 class TestCLI(unittest.TestCase):
 
-    @patch("builtins.input", side_effect=mock_password_input)
+    @patch("carbontracker.tracker.CarbonTracker")
     @patch("sys.argv", ["python -c 'print('Test')'", "--log_dir", "./test_logs"])
-    def test_main_with_args(self, mock_input):
-        sleep(2)
+    def test_main_with_args(self, mock_tracker):
         captured_output = StringIO()
         sys.stdout = captured_output
 
-        cli.main()
-        self.assertIn("CarbonTracker: The following components", captured_output.getvalue())
+        self.assertEqual(cli.main(), 2)
+        self.assertIn("usage:", captured_output.getvalue())
+        mock_tracker.assert_not_called()
 
 
-    @patch("builtins.input", side_effect=mock_password_input)
+    @patch("carbontracker.tracker.CarbonTracker")
     @patch("sys.argv", ["python -c 'print('Test')'"])
-    def test_main_without_args(self, mock_input):
-        sleep(2)
+    def test_main_without_args(self, mock_tracker):
         captured_output = StringIO()
         sys.stdout = captured_output
 
-        cli.main()
-        self.assertIn("CarbonTracker: The following components", captured_output.getvalue())
+        self.assertEqual(cli.main(), 2)
+        self.assertIn("usage:", captured_output.getvalue())
+        mock_tracker.assert_not_called()
 
     @patch("builtins.input", side_effect=mock_password_input)
     @patch("subprocess.run", autospec=True)
@@ -60,5 +60,61 @@ class TestCLI(unittest.TestCase):
         cli.main()
         mock_subprocess.assert_called_once_with(["echo 'test'"], check=True)
 
+    @patch("subprocess.run", autospec=True)
+    @patch("carbontracker.tracker.CarbonTracker")
+    @patch.object(sys, "argv", ["cli.py", "--api_keys", '{"electricitymaps": "KEY"}', "echo 'test'"])
+    def test_main_with_api_keys(self, mock_tracker, mock_subprocess):
+        cli.main()
+        mock_tracker.assert_called_once_with(
+            epochs=1,
+            log_dir="./logs",
+            epochs_before_pred=0,
+            api_keys={"electricitymaps": "KEY"},
+            offline=False,
+        )
+
+    @patch("subprocess.run", autospec=True)
+    @patch("carbontracker.tracker.CarbonTracker")
+    @patch.object(sys, "argv", ["cli.py", "--offline", "echo 'test'"])
+    def test_main_offline(self, mock_tracker, mock_subprocess):
+        cli.main()
+        mock_tracker.assert_called_once_with(
+            epochs=1, log_dir="./logs", epochs_before_pred=0, api_keys=None, offline=True
+        )
+        mock_subprocess.assert_called_once_with(["echo 'test'"], check=True)
+
+    @patch("subprocess.run", autospec=True)
+    @patch("carbontracker.tracker.CarbonTracker")
+    @patch.object(sys, "argv", ["cli.py", "--offline", "--country", "DK", "echo 'test'"])
+    def test_main_offline_country(self, mock_tracker, mock_subprocess):
+        cli.main()
+        mock_tracker.assert_called_once_with(
+            epochs=1, log_dir="./logs", epochs_before_pred=0, api_keys=None, offline="DK"
+        )
+
+    @patch("carbontracker.tracker.CarbonTracker")
+    @patch.object(sys, "argv", ["cli.py", "--api_keys", "{electricitymaps: KEY}"])
+    def test_main_with_invalid_api_keys(self, mock_tracker):
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            with self.assertRaises(SystemExit):
+                cli.main()
+        self.assertIn("double-quoted", mock_stderr.getvalue())
+        mock_tracker.assert_not_called()
+
+    @patch("carbontracker.tracker.CarbonTracker")
+    @patch("carbontracker.parser.print_aggregate")
+    @patch.object(sys, "argv", ["cli.py", "--parse", "./logs"])
+    def test_main_parse(self, mock_print_aggregate, mock_tracker):
+        cli.main()
+        mock_print_aggregate.assert_called_once_with(log_dir="./logs")
+        mock_tracker.assert_not_called()
+
+    def test_parse_api_keys(self):
+        self.assertEqual(cli.parse_api_keys('{"electricitymaps": "KEY"}'), {"electricitymaps": "KEY"})
+        self.assertIsNone(cli.parse_api_keys(""))
+
+    def test_parse_api_keys_python_literal(self):
+        self.assertEqual(cli.parse_api_keys("{'electricitymaps': 'KEY'}"), {"electricitymaps": "KEY"})
+
 if __name__ == "__main__":
     unittest.main()
@@ -4,10 +4,12 @@ import numpy as np
 
 from carbontracker import exceptions
 from carbontracker.components.gpu import nvidia
+from carbontracker.components.apple_silicon.powermetrics import AppleSiliconGPU
 from carbontracker.components.component import (
     Component,
     create_components,
     error_by_name,
+    handlers_by_name,
 )
 
 
@@ -62,14 +64,23 @@ class TestComponent(unittest.TestCase):
         component = Component(name="cpu", pids=[], devices_by_pid=False)
         component._handler = handler_mock
         component.collect_power_usage(epoch=1)
-        self.assertEqual(component.power_usages, [[], [0]])
+        self.assertEqual([list(p) for p in component.power_usages], [[], [0]])
 
     def test_collect_power_usage_with_measurement(self):
         handler_mock = MagicMock(power_usage=MagicMock(return_value=[1000]))
         component = Component(name="cpu", pids=[], devices_by_pid=False)
         component._handler = handler_mock
         component.collect_power_usage(epoch=1)
-        self.assertEqual(component.power_usages, [[1000]])
+        self.assertEqual([list(p) for p in component.power_usages], [[1000]])
+
+    def test_collect_power_usage_multiple_devices(self):
+        handler_mock = MagicMock(power_usage=MagicMock(return_value=[100, 200]))
+        component = Component(name="gpu", pids=[], devices_by_pid=False)
+        component._handler = handler_mock
+        component.collect_power_usage(epoch=1)
+        component.collect_power_usage(epoch=1)
+        self.assertEqual([list(p) for p in component.power_usages], [[300, 300]])
+        self.assertAlmostEqual(component.energy_usage([3600])[0], 0.3)
 
     def test_collect_power_usage_with_measurement_but_no_epoch(self):
         power_collector = Component(name="cpu", pids=[], devices_by_pid=False)
@@ -84,6 +95,16 @@ class TestComponent(unittest.TestCase):
         power_collector.collect_power_usage(epoch=3)
         assert len(power_collector.power_usages) == 3
 
+    def test_collect_power_usage_copies_are_not_shared(self):
+        power_collector = Component(name="cpu", pids=[], devices_by_pid=False)
+        power_collector._handler = MagicMock(power_usage=MagicMock(return_value=[1000]))
+        power_collector.collect_power_usage(epoch=1)
+        power_collector.collect_power_usage(epoch=4)
+        power_usages = power_collector.power_usages
+        self.assertEqual([list(p) for p in power_usages[:3]], [[1000]] * 3)
+        self.assertIsNot(power_usages[0], power_usages[1])
+        self.assertIsNot(power_usages[1], power_usages[2])
+
     def test_collect_power_usage_GPUPowerUsageRetrievalError(self):
         handler_mock = MagicMock(
             power_usage=MagicMock(side_effect=exceptions.GPUPowerUsageRetrievalError)
@@ -91,7 +112,7 @@ class TestComponent(unittest.TestCase):
         component = Component(name="gpu", pids=[], devices_by_pid=False)
         component._handler = handler_mock
         component.collect_power_usage(epoch=1)
-        self.assertEqual(component.power_usages, [[], [0]])
+        self.assertEqual([list(p) for p in component.power_usages], [[], [0]])
 
     def test_energy_usage(self):
         component = Component(name="cpu", pids=[], devices_by_pid=False)
@@ -120,6 +141,21 @@ class TestComponent(unittest.TestCase):
             [0.0002777777777777778, 0.0011111111111111111, 0.0025, 0.0025],
         )
 
+    def test_energy_usage_with_power_from_next_epoch(self):
+        component = Component(name="cpu", pids=[], devices_by_pid=False)
+        component.power_usages = [[], [1000, 3000], [], [], [4000]]
+        epoch_times = [1, 2, 3, 4]
+        energy_usages = component.energy_usage(epoch_times)
+        expected_energy_usages = [
+            2000 / 3600000,
+            4000 / 3600000,
+            12000 / 3600000,
+            16000 / 3600000,
+        ]
+        assert np.allclose(
+            energy_usages, expected_energy_usages
+        ), f"Expected {expected_energy_usages}, but got {energy_usages}"
+
     def test_energy_usage_no_power(self):
         component = Component(name="cpu", pids=[], devices_by_pid=False)
         component.power_usages = [[], [], [], [], []]
@@ -157,6 +193,29 @@ class TestComponent(unittest.TestCase):
         self.assertEqual(len(cpu), 1)
         self.assertEqual(len(all_components), 2)
 
+    @patch("carbontracker.components.component.handlers_by_name")
+    def test_create_components_passes_include_graphics(self, mock_handlers_by_name):
+        gpu_handler = MagicMock(options=("include_graphics",))
+        cpu_handler = MagicMock(options=())
+        mock_handlers_by_name.side_effect = lambda name: {
+            "gpu": [gpu_handler],
+            "cpu": [cpu_handler],
+        }[name]
+        create_components("all", pids=[1], devices_by_pid=True, include_graphics=True)
+        gpu_handler.assert_called_once_with(
+            pids=[1], devices_by_pid=True, include_graphics=True
+        )
+        cpu_handler.assert_called_once_with(pids=[1], devices_by_pid=True)
+
+    @patch(
+        "carbontracker.components.gpu.nvidia.NvidiaGPU.available", return_value=True
+    )
+    def test_init_include_graphics_nvidia(self, mock_available):
+        component = Component(
+            name="gpu", pids=[], devices_by_pid=True, include_graphics=True
+        )
+        self.assertTrue(component.handler.include_graphics)
+
     def test_error_by_name(self):
         self.assertEqual(
             str(error_by_name("gpu")), str(exceptions.GPUError("No GPU(s) available."))
@@ -164,6 +223,15 @@ class TestComponent(unittest.TestCase):
         self.assertEqual(
             str(error_by_name("cpu")), str(exceptions.CPUError("No CPU(s) available."))
         )
+        with self.assertRaises(exceptions.ComponentNameError):
+            error_by_name("unknown")
+
+    def test_handlers_by_name(self):
+        self.assertEqual(
+            handlers_by_name("gpu"), [nvidia.NvidiaGPU, AppleSiliconGPU]
+        )
+        with self.assertRaises(exceptions.ComponentNameError):
+            handlers_by_name("unknown")
 
     def test_handler_property_with_handler_set(self):
         component = Component(name="gpu", pids=[], devices_by_pid=False)
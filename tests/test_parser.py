@@ -278,6 +278,23 @@ class TestParser(fake_filesystem_unittest.TestCase):
         self.assertIn("gpu", components)
         self.assertIn("cpu", components)
 
+    def test_get_avg_power_usages_multiple_epochs(self):
+        std_log_data = (
+            "2022-11-14 15:44:48 - Average power usage (W) for gpu: [136.86084615]\n"
+            "2022-11-14 15:44:48 - Average power usage (W) for cpu: [13.389104]\n"
+            "2022-11-14 15:45:48 - Average power usage (W) for gpu: None\n"
+            "2022-11-14 15:45:48 - Average power usage (W) for cpu: 14.5\n"
+        )
+
+        avg_power_usages = parser.get_avg_power_usages(std_log_data)
+
+        expected_avg_power_usages = {
+            "gpu": [[136.86084615], [0.0]],
+            "cpu": [[13.389104], [14.5]],
+        }
+
+        self.assertEqual(avg_power_usages, expected_avg_power_usages)
+
     def test_get_avg_power_usages_none_power(self):
         std_log_data = "2022-11-14 15:44:48 - Average power usage (W) for gpu: None"
 
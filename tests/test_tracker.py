@@ -1,10 +1,11 @@
 import os
+import sys
 import threading
 import time
 import traceback
 import unittest
 from unittest import mock, skipIf
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, Mock, call, patch, MagicMock
 from threading import Event
 from typing import List, Any
 import numpy as np
@@ -14,6 +15,7 @@ from carbontracker.tracker import (
     CarbonIntensityThread,
     CarbonTrackerThread,
     CarbonTracker,
+    FORECAST_RESOLUTION,
 )
 from carbontracker.components.component import Component
 from carbontracker.components.gpu import nvidia
@@ -73,6 +75,22 @@ class TestCarbonIntensityThread(unittest.TestCase):
         self.logger.info.assert_called()
         self.logger.output.assert_called()
 
+    @patch("carbontracker.tracker.intensity")
+    def test_predict_carbon_intensity_weighted_average(self, mock_intensity):
+        mock_intensity.carbon_intensity.return_value = Mock(
+            carbon_intensity=100.0, is_prediction=True
+        )
+
+        thread = CarbonIntensityThread(
+            self.logger, self.stop_event, update_interval=1000
+        )
+        thread.join(timeout=0.1)
+        thread.carbon_intensities = [Mock(carbon_intensity=40.0)]
+        ci = thread.predict_carbon_intensity(2000)
+
+        # The prediction is weighted by the 3 update intervals it covers.
+        self.assertAlmostEqual(ci.carbon_intensity, (40.0 + 3 * 100.0) / 4)
+
     @patch("carbontracker.tracker.intensity.CarbonIntensity")
     @patch("carbontracker.tracker.intensity")
     def test_average_carbon_intensity(self, mock_intensity, mock_carbon_intensity):
@@ -126,6 +144,130 @@ class TestCarbonIntensityThread(unittest.TestCase):
 
         assert len(thread.carbon_intensities) == 1
 
+    @patch("carbontracker.tracker.intensity.carbon_intensity")
+    def test_average_carbon_intensity_reuses_current_intensity_from_prediction(
+        self, mock_carbon_intensity
+    ):
+        self.stop_event.set()
+        thread = CarbonIntensityThread(self.logger, self.stop_event)
+        thread.join(timeout=1)
+        thread.carbon_intensities = []
+        mock_carbon_intensity.reset_mock()
+        mock_carbon_intensity.return_value = MagicMock(
+            success=True, carbon_intensity=481, address="test_address", is_prediction=False
+        )
+
+        thread.predict_carbon_intensity(1000)
+        avg_ci = thread.average_carbon_intensity()
+
+        mock_carbon_intensity.assert_called_once_with(
+            self.logger, time_dur=1000, offline=False
+        )
+        self.assertEqual(avg_ci.carbon_intensity, 481)
+
+    @patch("carbontracker.tracker.intensity.carbon_intensity")
+    def test_average_carbon_intensity_retries_failed_fetch(
+        self, mock_carbon_intensity
+    ):
+        mock_carbon_intensity.side_effect = [
+            MagicMock(success=False, carbon_intensity=300, address="test_address"),
+            MagicMock(success=True, carbon_intensity=481, address="test_address"),
+        ]
+        self.stop_event.set()
+
+        thread = CarbonIntensityThread(self.logger, self.stop_event)
+        thread.join(timeout=1)
+        self.assertEqual(thread.carbon_intensities, [])
+        avg_ci = thread.average_carbon_intensity()
+
+        self.assertEqual(mock_carbon_intensity.call_count, 2)
+        self.assertEqual(avg_ci.carbon_intensity, 481)
+
+    @patch("carbontracker.tracker.intensity.carbon_intensity")
+    def test_fetch_carbon_intensity_offline(self, mock_carbon_intensity):
+        self.stop_event.set()
+
+        thread = CarbonIntensityThread(self.logger, self.stop_event, offline=True)
+        thread.join(timeout=1)
+
+        mock_carbon_intensity.assert_called_once_with(self.logger, offline=True)
+
+    @patch("carbontracker.tracker.intensity")
+    def test_predict_carbon_intensity_uses_prefetch(self, mock_intensity):
+        mock_intensity.carbon_intensity.return_value = MagicMock(
+            carbon_intensity=10.5
+        )
+
+        thread = CarbonIntensityThread(self.logger, self.stop_event)
+        thread.join(timeout=0.1)
+        mock_intensity.carbon_intensity.reset_mock()
+        thread.prefetch_prediction(1000)
+        ci = thread.predict_carbon_intensity(1000)
+
+        mock_intensity.carbon_intensity.assert_called_once_with(
+            self.logger, time_dur=1000, offline=False
+        )
+        self.assertEqual(ci.carbon_intensity, 10.5)
+        self.assertIsNone(thread._prefetched_prediction)
+
+    @patch("carbontracker.tracker.intensity")
+    def test_predict_carbon_intensity_reuses_prefetch_within_resolution(
+        self, mock_intensity
+    ):
+        thread = CarbonIntensityThread(self.logger, self.stop_event)
+        thread.join(timeout=0.1)
+        mock_intensity.carbon_intensity.reset_mock()
+        mock_intensity.carbon_intensity.return_value = MagicMock(
+            carbon_intensity=10.5, is_prediction=True
+        )
+        thread.prefetch_prediction(36000.5)
+        ci = thread.predict_carbon_intensity(36900.25)
+
+        mock_intensity.carbon_intensity.assert_called_once_with(
+            self.logger, time_dur=36000.5, offline=False
+        )
+        self.assertEqual(ci.carbon_intensity, 10.5)
+
+    @patch("carbontracker.tracker.intensity")
+    def test_predict_carbon_intensity_reuses_current_intensity_prefetch(
+        self, mock_intensity
+    ):
+        thread = CarbonIntensityThread(self.logger, self.stop_event)
+        thread.join(timeout=0.1)
+        mock_intensity.carbon_intensity.reset_mock()
+        mock_intensity.carbon_intensity.return_value = MagicMock(
+            carbon_intensity=10.5, is_prediction=False, success=True
+        )
+        thread.prefetch_prediction(1000)
+        ci = thread.predict_carbon_intensity(100000)
+
+        mock_intensity.carbon_intensity.assert_called_once()
+        self.assertEqual(ci.carbon_intensity, 10.5)
+
+    @patch("carbontracker.tracker.intensity")
+    def test_predict_carbon_intensity_ignores_prefetch_for_other_duration(
+        self, mock_intensity
+    ):
+        thread = CarbonIntensityThread(self.logger, self.stop_event)
+        thread.join(timeout=0.1)
+        mock_intensity.carbon_intensity.reset_mock()
+        mock_intensity.carbon_intensity.side_effect = [
+            MagicMock(carbon_intensity=10.5, is_prediction=True),
+            MagicMock(carbon_intensity=20.5, is_prediction=True),
+        ]
+        thread.prefetch_prediction(1000)
+        ci = thread.predict_carbon_intensity(1000 + FORECAST_RESOLUTION)
+
+        self.assertEqual(
+            mock_intensity.carbon_intensity.call_args_list,
+            [
+                call(self.logger, time_dur=1000, offline=False),
+                call(self.logger, time_dur=1000 + FORECAST_RESOLUTION, offline=False),
+            ],
+        )
+        self.assertEqual(ci.carbon_intensity, 20.5)
+        self.assertIsNone(thread._prefetched_prediction)
+
 
 class TestCarbonTrackerThread(unittest.TestCase):
     def setUp(self):
@@ -165,6 +307,30 @@ class TestCarbonTrackerThread(unittest.TestCase):
             "Finished monitoring.", verbose_level=1
         )
 
+    def test_stop_wakes_idle_thread(self):
+        time.sleep(0.1)
+        self.thread.stop()
+        self.thread.join(timeout=1)
+
+        self.assertFalse(self.thread.is_alive())
+        for component in self.mock_components:
+            component.shutdown.assert_called_once()
+            component.collect_power_usage.assert_not_called()
+
+    def test_stop_at_exit(self):
+        time.sleep(0.1)
+        self.thread._stop_at_exit()
+
+        self.assertFalse(self.thread.is_alive())
+        for component in self.mock_components:
+            component.shutdown.assert_called_once()
+
+    @patch("carbontracker.tracker.atexit.unregister")
+    def test_stop_unregisters_exit_handler(self, mock_unregister):
+        self.thread.stop()
+
+        mock_unregister.assert_called_once_with(self.thread._stop_at_exit)
+
     def test_stop_tracker_not_running(self):
         self.thread.running = False
         result = self.thread.stop()
@@ -188,6 +354,22 @@ class TestCarbonTrackerThread(unittest.TestCase):
         for component in self.mock_components:
             component.collect_power_usage.assert_called_with(self.thread.epoch_counter)
 
+    def test_run_interval_excludes_collection_time(self):
+        def slow_collect(epoch):
+            time.sleep(0.05)
+
+        for component in self.mock_components:
+            component.collect_power_usage.side_effect = slow_collect
+
+        self.thread.epoch_start()
+        time.sleep(0.55)
+        self.thread.epoch_end()
+
+        # Two components each taking 0.05 s per round would only give ~3
+        # rounds if collection time was added to the 0.1 s update interval.
+        calls = self.mock_components[0].collect_power_usage.call_count
+        self.assertGreaterEqual(calls, 5)
+
     def test_init(self):
         mock_components: List[Component] = [
             MagicMock(name="Component1"),
@@ -370,6 +552,19 @@ class TestCarbonTracker(unittest.TestCase):
         self.assertEqual(self.tracker.epoch_counter, initial_epoch_counter + 1)
         self.assertTrue(self.mock_tracker_thread.measuring_event.is_set())
 
+    def test_epoch_start_prefetches_prediction(self):
+        assert self.tracker is not None
+        assert self.mock_tracker_thread is not None
+        assert self.mock_intensity_thread is not None
+        self.tracker.epochs_before_pred = 2
+        self.mock_tracker_thread.epoch_times = [10]
+
+        self.tracker.epoch_start()
+        self.mock_intensity_thread.prefetch_prediction.assert_not_called()
+        self.tracker.epoch_start()
+
+        self.mock_intensity_thread.prefetch_prediction.assert_called_once_with(50)
+
     def test_check_input_yes(self):
         with patch("builtins.input", return_value="y"):
             assert self.tracker is not None
@@ -405,11 +600,20 @@ class TestCarbonTracker(unittest.TestCase):
             self.tracker._check_input("y")
             self.mock_logger.output.assert_any_call("Continuing...")
 
+    def test_check_input_many_invalid(self):
+        assert self.tracker is not None
+        assert self.mock_logger is not None
+        invalid_inputs = [""] * (sys.getrecursionlimit() + 1)
+        with patch("builtins.input", side_effect=invalid_inputs + ["y"]):
+            self.tracker._check_input("a")
+            self.mock_logger.output.assert_called_with("Continuing...")
+
     def test_delete(self):
         assert self.tracker is not None
         assert self.mock_tracker_thread is not None
         self.tracker._delete()
         self.mock_tracker_thread.stop.assert_called_once()
+        self.mock_tracker_thread.join.assert_called_once()
         self.assertTrue(self.tracker.deleted)
 
     @patch("carbontracker.tracker.psutil.Process")
@@ -484,6 +688,24 @@ class TestCarbonTracker(unittest.TestCase):
         mock_output_pred.assert_called_once()
         mock_user_query.assert_called_once()
 
+    @patch("carbontracker.tracker.CarbonTracker._delete", autospec=True)
+    @patch("carbontracker.tracker.CarbonTracker._output_actual", autospec=True)
+    @patch("carbontracker.tracker.CarbonTracker._output_pred", autospec=True)
+    @patch("carbontracker.tracker.CarbonTracker._user_query", autospec=True)
+    def test_epoch_end_skips_pred_after_last_epoch(
+        self, mock_user_query, mock_output_pred, mock_output_actual, mock_delete
+    ):
+        assert self.tracker is not None
+        self.tracker.epochs = 1
+        self.tracker.monitor_epochs = 1
+        self.tracker.epoch_counter = self.tracker.epochs_before_pred
+        self.tracker.epoch_end()
+
+        mock_output_pred.assert_not_called()
+        mock_user_query.assert_not_called()
+        mock_output_actual.assert_called_once()
+        mock_delete.assert_called_once()
+
     @patch("carbontracker.tracker.CarbonTracker._handle_error", autospec=True)
     def test_epoch_end_exception_handling(self, mock_handle_error):
         assert self.tracker is not None
@@ -582,6 +804,23 @@ class TestCarbonTracker(unittest.TestCase):
         with self.assertRaises(SystemExit):
             self.tracker._handle_error(Exception("Test exception"))
 
+    @patch("carbontracker.tracker.CarbonIntensityThread")
+    @patch("carbontracker.tracker.CarbonTrackerThread")
+    @patch("carbontracker.tracker.loggerutil.Logger")
+    @patch("carbontracker.tracker.component.create_components")
+    def test_init_passes_include_graphics(
+        self, mock_create_components, mock_logger, mock_tracker_thread, mock_thread
+    ):
+        CarbonTracker(
+            epochs=1, components="gpu", devices_by_pid=True, include_graphics=True
+        )
+        mock_create_components.assert_called_once_with(
+            components="gpu",
+            pids=ANY,
+            devices_by_pid=True,
+            include_graphics=True,
+        )
+
     @skipIf(os.environ.get("CI") == "true", "Skipped due to CI")
     @patch(
         "carbontracker.emissions.intensity.fetchers.electricitymaps.ElectricityMap.set_api_key"